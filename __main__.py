@@ -1,16 +1,274 @@
+import os
+import time
+
 import click
 
-from exif_edit.gui import App
+#the modules of the commands are imported by the commands, so that a command loads only what
+#it needs and the headless commands never load the GUI
+from exif_edit.tracing import Tracer
+
+#the formats of export and import, the same as those of Exporter and Manifest
+CSV = "csv"
+JSONL = "jsonl"
 
 
-@click.command()
+def existing(ctx, param, paths):
+    """Raises a BadParameter for the files, directories or globs, which match nothing."""
+    from exif_edit.batch import Batch
+    missing = Batch.unmatched(paths)
+    if missing:
+        raise click.BadParameter(f"no such file, directory or match: {', '.join(missing)}")
+    return paths
+
+@click.group(invoke_without_command=True)
 @click.option("--img",
-    help="The path to the image which should be loaded on start.")
-def start(img):
+    help="The path to the image which should be loaded on start, or a folder to browse.")
+@click.option("--trace", type=click.Path(dir_okay=False), envvar="EXIF_EDIT_TRACE",
+    help="A file to write the spans of reading, showing and saving to, in the Chrome trace format. "
+    "The spans of worker processes are lost, use --workers 1 to trace a command.")
+@click.pass_context
+def start(ctx, img, trace):
+    if trace is not None:
+        tracer = Tracer()
+        tracer.install()
+        ctx.call_on_close(lambda: tracer.save(trace))
+    if ctx.invoked_subcommand is not None:
+        return
+    from exif_edit.gui import App
     app = App()
-    if img is not None:
+    if img is not None and os.path.isdir(img):
+        app.load_folder(img)
+    elif img is not None:
         app.load_image(img)
     app.start()
 
+@start.command()
+@click.argument("paths", nargs=-1, required=True, callback=existing)
+@click.option("--set", "assignments", multiple=True, metavar="KEY=VALUE",
+    help="A tag to assign, can be given multiple times.")
+@click.option("--delete", "deletions", multiple=True, metavar="KEY",
+    help="A tag to delete, can be given multiple times.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def batch(paths, assignments, deletions, workers):
+    """Edits the tags of all images in the given files, directories or globs."""
+    from exif_edit.batch import Batch, Edits
+    try:
+        edits = Edits.parse(assignments, deletions)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc))
+
+    report(Batch(workers).edit(paths, edits))
+
+@start.command()
+@click.argument("paths", nargs=-1, required=True, callback=existing)
+@click.option("--format", "fmt", type=click.Choice([CSV, JSONL]),
+    default=CSV, show_default=True, help="CSV rows of path, key and value, "
+    "or one JSON object per image.")
+@click.option("--output", type=click.File("w", encoding="utf-8"), default="-",
+    help="The file to write, defaults to the standard output.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def export(paths, fmt, output, workers):
+    """Exports the tags of all images in the given files, directories or globs."""
+    from exif_edit.batch import Batch
+    from exif_edit.export import Exporter
+
+    def failed(path, error):
+        click.echo(f"failed {path}: {error}", err=True)
+
+    begin = time.perf_counter()
+    res = Exporter(Batch(workers), failed).export(paths, output, fmt)
+    elapsed = time.perf_counter() - begin
+    click.echo(f"{res.images} files, {res.rows} rows in {elapsed:.2f} s, {res.failed} failed",
+        err=True)
+    if res.failed > 0:
+        raise SystemExit(1)
+
+@start.command("import")
+@click.argument("manifest", type=click.File("r", encoding="utf-8"))
+@click.option("--format", "fmt", type=click.Choice([CSV, JSONL]),
+    help="The format of the manifest, defaults to its extension.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def import_manifest(manifest, fmt, workers):
+    """Applies the edits of a manifest, as written by export, every image is saved once."""
+    from exif_edit.batch import Batch
+    from exif_edit.manifest import Manifest
+
+    if fmt is None:
+        fmt = Manifest.JSONL if manifest.name.lower().endswith(".jsonl") else Manifest.CSV
+    try:
+        edits = Manifest.load(manifest, fmt)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc))
+
+    click.echo(f"{edits.rows} edits for {len(edits)} files, "
+        f"{edits.skipped} of read only or locked tags skipped", err=True)
+    report(edits.apply(Batch(workers)))
+
+@start.command()
+@click.argument("gpx", type=click.Path(exists=True, dir_okay=False))
+@click.argument("paths", nargs=-1, required=True, callback=existing)
+@click.option("--offset", type=float,
+    help="The difference of the camera clock to UTC in hours, e.g. 2 for CEST. "
+    "Defaults to the offset in the Exif tags or else 0.")
+@click.option("--max-gap", type=float, default=60.0, show_default=True,
+    help="The maximal seconds between the capture time and a point of the track.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def geotag(gpx, paths, offset, max_gap, workers):
+    """Writes the location from a GPX track to all images in the given files, directories or globs."""
+    import xml.etree.ElementTree as ET
+
+    from exif_edit.batch import Batch
+    from exif_edit.geotag import Geotagger, Track
+
+    try:
+        track = Track.load(gpx)
+    except (ET.ParseError, ValueError) as exc:
+        raise click.BadParameter(str(exc))
+
+    offset = None if offset is None else offset * 3600
+    report(Geotagger(track, offset, max_gap, Batch(workers)).tag(paths))
+
+@start.group()
+def places():
+    """Finds images by their location, using an index of a whole library."""
+
+@places.command("build")
+@click.argument("index", type=click.Path(dir_okay=False))
+@click.argument("paths", nargs=-1, required=True, callback=existing)
+@click.option("--cell", type=float, default=0.1, show_default=True,
+    help="The size of a cell of the grid in degrees.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def places_build(index, paths, cell, workers):
+    """Reads the locations of all images in the given files, directories or globs into the index."""
+    from exif_edit.batch import Batch
+    from exif_edit.spatial import SpatialIndex
+
+    begin = time.perf_counter()
+    spatial = SpatialIndex.build(paths, Batch(workers), cell)
+    spatial.save(index)
+    click.echo(f"{len(spatial)} images with a location in {time.perf_counter() - begin:.2f} s")
+
+@places.command("near", context_settings={"ignore_unknown_options": True})
+@click.argument("index", type=click.Path(exists=True, dir_okay=False))
+@click.argument("latitude", type=float)
+@click.argument("longitude", type=float)
+@click.option("--km", type=float, default=1.0, show_default=True,
+    help="The radius around the point.")
+def places_near(index, latitude, longitude, km):
+    """Lists the images within the radius around the point, the nearest first."""
+    from exif_edit.spatial import SpatialIndex
+
+    spatial = SpatialIndex.load(index)
+    begin = time.perf_counter()
+    found = spatial.within(latitude, longitude, km)
+    elapsed = time.perf_counter() - begin
+    for path, lat, lon, dist in found:
+        click.echo(f"{path} {lat:.6f} {lon:.6f} {dist:.3f} km")
+    click.echo(f"{len(found)} images in {elapsed * 1000:.1f} ms")
+
+@places.command("bbox", context_settings={"ignore_unknown_options": True})
+@click.argument("index", type=click.Path(exists=True, dir_okay=False))
+@click.argument("south", type=float)
+@click.argument("west", type=float)
+@click.argument("north", type=float)
+@click.argument("east", type=float)
+def places_bbox(index, south, west, north, east):
+    """Lists the images inside the box."""
+    from exif_edit.spatial import SpatialIndex
+
+    spatial = SpatialIndex.load(index)
+    begin = time.perf_counter()
+    found = spatial.bbox(south, west, north, east)
+    elapsed = time.perf_counter() - begin
+    for path, lat, lon in found:
+        click.echo(f"{path} {lat:.6f} {lon:.6f}")
+    click.echo(f"{len(found)} images in {elapsed * 1000:.1f} ms")
+
+@start.group()
+def catalog():
+    """Keeps the tags of a whole library in a database for fast queries."""
+
+@catalog.command("scan")
+@click.argument("db", type=click.Path(dir_okay=False))
+@click.argument("paths", nargs=-1, required=True, callback=existing)
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def catalog_scan(db, paths, workers):
+    """Adds or updates the images in the given files, directories or globs, which changed."""
+    from exif_edit.batch import Batch
+    from exif_edit.catalog import Catalog
+
+    with Catalog(db) as cat:
+        res = cat.scan(paths, Batch(workers))
+    click.echo(f"{res.added} added, {res.updated} updated, {res.unchanged} unchanged, "
+        f"{res.removed} removed, {res.failed} failed in {res.elapsed:.2f} s")
+
+@catalog.command("watch")
+@click.argument("db", type=click.Path(dir_okay=False))
+@click.argument("directories", nargs=-1, required=True,
+    type=click.Path(exists=True, file_okay=False))
+@click.option("--interval", type=float, default=2.0, show_default=True,
+    help="The seconds between two polls.")
+@click.option("--workers", type=int,
+    help="The number of processes, defaults to the number of CPUs.")
+def catalog_watch(db, directories, interval, workers):
+    """Keeps the catalog current, while images in the directories are added, changed or removed."""
+    from exif_edit.batch import Batch
+    from exif_edit.catalog import Catalog
+    from exif_edit.watcher import Watcher
+
+    def echo(change):
+        click.echo(f"{change.added} added, {change.updated} updated, {len(change.removed)} removed, "
+            f"{change.failed} failed in {change.elapsed:.2f} s")
+
+    with Catalog(db) as cat:
+        try:
+            Watcher(cat, directories, interval, Batch(workers)).run(echo)
+        except KeyboardInterrupt:
+            pass
+
+@catalog.command("find", context_settings={"ignore_unknown_options": True})
+@click.argument("db", type=click.Path(exists=True, dir_okay=False))
+@click.option("--camera", help="The make or model of the camera.")
+@click.option("--year", type=int, help="The year the images were taken.")
+@click.option("--since", metavar="YYYY-MM-DD", help="The first day the images were taken.")
+@click.option("--until", metavar="YYYY-MM-DD", help="The last day the images were taken.")
+@click.option("--bbox", type=float, nargs=4, metavar="SOUTH WEST NORTH EAST",
+    help="The box the images were taken in.")
+def catalog_find(db, camera, year, since, until, bbox):
+    """Lists the images, which match all given criteria, ordered by the time they were taken."""
+    from exif_edit.catalog import Catalog
+
+    with Catalog(db) as cat:
+        begin = time.perf_counter()
+        found = cat.find(camera, year, since, until, bbox or None)
+        elapsed = time.perf_counter() - begin
+    for path, taken in found:
+        click.echo(f"{path} {taken or ''}")
+    click.echo(f"{len(found)} images in {elapsed * 1000:.1f} ms")
+
+def report(results):
+    """Prints the results and a summary, exits with 1 if any image failed."""
+    count = failed = 0
+    begin = time.perf_counter()
+    for result in results:
+        count += 1
+        if result.failed():
+            failed += 1
+            click.echo(f"{result.status} {result.path}: {result.error}", err=True)
+        else:
+            click.echo(f"{result.status} {result.path} ({result.elapsed * 1000:.1f} ms)")
+
+    elapsed = time.perf_counter() - begin
+    rate = count / elapsed if elapsed > 0 else 0
+    click.echo(f"{count} files in {elapsed:.2f} s ({rate:.1f} files/s), {failed} failed")
+    if failed > 0:
+        raise SystemExit(1)
+
 if __name__ == "__main__":
    start()
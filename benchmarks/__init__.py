@@ -0,0 +1,3 @@
+"""
+Benchmarks of the hot paths, run them from the root of the repository.
+"""
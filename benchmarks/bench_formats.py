@@ -0,0 +1,67 @@
+"""
+Measures parsing the formats with the fast path and its cache against the regular expressions,
+and the memory of many formatted GPS values with and without interning.
+
+python3 -m benchmarks.bench_formats
+"""
+import timeit
+import tracemalloc
+
+from exif_edit.formats import DegreeFormatFactory, DmsFormat, TimeStamp
+
+
+VALUES = 100000
+
+SAMPLES = (("dms", "78°55'{}\"", DegreeFormatFactory.parse, DegreeFormatFactory.search),
+    ("decimal", "30.{}°", DegreeFormatFactory.parse, DegreeFormatFactory.search),
+    ("timestamp", "15:00:{}", TimeStamp.parse, TimeStamp.search))
+
+
+def per_call(func, texts) -> float:
+    """
+    Returns the microseconds per call of the function for every text.
+    """
+    it = iter(texts)
+    return timeit.timeit(lambda: func(next(it)), number=len(texts)) / len(texts) * 1e6
+
+
+def parsing(count = VALUES) -> list:
+    """
+    Returns the name and the microseconds per call of the fast path and of the regular expressions
+    for every sample. Repeated values are like the points of a track, unique values are parsed
+    for the first time.
+    """
+    lst = []
+    for name, pattern, parse, search in SAMPLES:
+        repeated = [pattern.format(i % 10) for i in range(count)]
+        unique = [pattern.format(i) for i in range(count)]
+        lst.append((name, "repeated", per_call(parse, repeated), per_call(search, repeated)))
+        lst.append((name, "unique", per_call(parse, unique), per_call(search, unique)))
+    return lst
+
+
+def memory(create, count = VALUES) -> int:
+    """
+    Returns the bytes allocated to hold the formats of a track, where every point repeats
+    one of a few coordinates.
+    """
+    tracemalloc.start()
+    formats = [create((48, 8, float(i % 100))) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del formats
+    return size
+
+
+def main():
+    print(f"{'sample':>10} {'values':>9} {'fast us':>10} {'regex us':>10} {'speedup':>8}")
+    for name, values, fast, slow in parsing():
+        print(f"{name:>10} {values:>9} {fast:>10.3f} {slow:>10.3f} {slow / fast:>7.1f}x")
+
+    plain = memory(DmsFormat)
+    interned = memory(DegreeFormatFactory.create)
+    print(f"{VALUES} dms values: {plain / 1024:.0f} KiB plain, {interned / 1024:.0f} KiB interned")
+
+
+if __name__ == "__main__":
+    main()
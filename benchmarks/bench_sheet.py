@@ -0,0 +1,60 @@
+"""
+Measures the latency of opening and sorting the table, as a function of the number of rows.
+The real spreadsheet widget is used, so a display is needed, e.g. a virtual one.
+
+python3 -m benchmarks.bench_sheet
+xvfb-run python3 -m benchmarks.bench_sheet
+"""
+import sys
+import timeit
+import tkinter as tk
+
+from tksheet import Sheet
+
+from exif_edit.converter import Converter, ExifFilter
+from exif_edit.mediator import Mediator
+
+
+ROW_COUNTS = (100, 1000, 5000, 20000)
+
+
+def synthetic_dict(count) -> dict:
+    """
+    Returns a grouped dictionary with the locked tags and generic tags,
+    like those of a large maker note expansion.
+    """
+    dic = {key: 0 for key in ExifFilter.locked()}
+    for i in range(count - len(dic)):
+        dic[f"maker_note_{i:05d}"] = str(i)
+    return Converter.group_dict(dic)
+
+
+def measure(mediator, count, repeat = 5) -> tuple:
+    """
+    Returns the best time in milliseconds to open and to sort a table with the given rows.
+    """
+    dic = synthetic_dict(count)
+    mediator.show_exif("synthetic.jpg", dic)
+    opening = min(timeit.repeat(lambda: mediator.show_exif("synthetic.jpg", dic),
+        number=1, repeat=repeat))
+    sorting = min(timeit.repeat(mediator.sort, number=1, repeat=repeat))
+    return opening * 1000, sorting * 1000
+
+
+def main():
+    try:
+        root = tk.Tk()
+    except tk.TclError as exc:
+        sys.exit(f"the table needs a display: {exc}")
+    root.withdraw()
+    sheet = Sheet(root, total_columns=2)
+    mediator = Mediator(sheet)
+    print(f"{'rows':>8} {'open ms':>10} {'sort ms':>10}")
+    for count in ROW_COUNTS:
+        opening, sorting = measure(mediator, count)
+        print(f"{count:>8} {opening:>10.2f} {sorting:>10.2f}")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
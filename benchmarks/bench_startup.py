@@ -0,0 +1,76 @@
+"""
+Measures the cold start of the headless commands and of the GUI in new interpreters.
+The GUI is measured until its first window is visible, which needs a display, e.g. a virtual one.
+
+python3 -m benchmarks.bench_startup
+xvfb-run python3 -m benchmarks.bench_startup
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+REPEAT = 10
+
+#the modules of the GUI, which a headless command should never import
+GUI_MODULES = ("tkinter", "tksheet", "idlelib", "PIL.ImageTk", "PIL.Image")
+
+LOOKUP = os.path.join("test", "resources", "lookup.jpg")
+
+COMMANDS = (("help", ["__main__.py", "--help"]),
+    ("export", ["__main__.py", "export", LOOKUP, "--output", os.devnull, "--workers", "1"]),
+    ("gui import", ["-c", "import exif_edit.gui"]))
+
+#the GUI is started like by the command, it quits as soon as its window is visible
+WINDOW = ("gui window", ["-c", "from exif_edit.gui import App; app = App(); "
+    "app.after_idle(lambda: (app.wait_visibility(), app.destroy())); app.start()"])
+
+
+def has_display() -> bool:
+    """
+    Returns True if a window can be opened.
+    """
+    return sys.platform in ("darwin", "win32") or bool(os.environ.get("DISPLAY"))
+
+
+def cold_start(args, repeat = REPEAT) -> list:
+    """
+    Returns the seconds of every run of a new interpreter with the arguments.
+    """
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        subprocess.run([sys.executable] + args, check=True, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - begin)
+    return times
+
+
+def imported(args) -> list:
+    """
+    Returns the modules of the GUI, which are imported by a run with the arguments.
+    """
+    res = subprocess.run([sys.executable, "-X", "importtime"] + args, check=True,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    names = {line.rsplit("|", 1)[-1].strip() for line in res.stderr.splitlines()}
+    return [name for name in GUI_MODULES if name in names]
+
+
+def main():
+    commands = COMMANDS + ((WINDOW,) if has_display() else ())
+    if not has_display():
+        print("no display, the start of the GUI until its window is visible is not measured")
+    print(f"{'start':>12} {'best ms':>10} {'median ms':>10}  gui modules")
+    baseline = min(cold_start(["-c", "pass"]))
+    print(f"{'python':>12} {baseline * 1000:>10.1f} {'':>10}")
+    for name, args in commands:
+        times = cold_start(args)
+        modules = ", ".join(imported(args)) or "none"
+        print(f"{name:>12} {min(times) * 1000:>10.1f} {statistics.median(times) * 1000:>10.1f}"
+            f"  {modules}")
+
+
+if __name__ == "__main__":
+    main()
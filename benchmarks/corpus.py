@@ -0,0 +1,209 @@
+"""
+Generates a synthetic corpus of JPEG images with the tags and file sizes of real cameras,
+so that the benchmarks do not depend on private photos. The corpus is deterministic for a seed.
+
+python3 -m benchmarks.corpus /tmp/corpus --count 20
+"""
+import argparse
+import io
+import os
+import random
+
+from typing import List, NamedTuple
+
+import numpy as np
+
+from PIL import Image
+from PIL.TiffImagePlugin import IFDRational
+
+
+class IFD:
+    """The tags of the sub IFDs. PIL.ExifTags names the tags only since Pillow 9.4."""
+    Exif = 0x8769
+    GPSInfo = 0x8825
+
+
+class Base:
+    """The tags of IFD 0 and of the Exif IFD, which are written."""
+    Make = 0x010F
+    Model = 0x0110
+    Orientation = 0x0112
+    XResolution = 0x011A
+    YResolution = 0x011B
+    ResolutionUnit = 0x0128
+    Software = 0x0131
+    DateTime = 0x0132
+    Artist = 0x013B
+    YCbCrPositioning = 0x0213
+    Copyright = 0x8298
+    ExposureTime = 0x829A
+    FNumber = 0x829D
+    ExposureProgram = 0x8822
+    ISOSpeedRatings = 0x8827
+    DateTimeOriginal = 0x9003
+    DateTimeDigitized = 0x9004
+    OffsetTimeOriginal = 0x9011
+    ShutterSpeedValue = 0x9201
+    ApertureValue = 0x9202
+    ExposureBiasValue = 0x9204
+    MeteringMode = 0x9207
+    Flash = 0x9209
+    FocalLength = 0x920A
+    MakerNote = 0x927C
+    UserComment = 0x9286
+    SubsecTimeOriginal = 0x9291
+    ColorSpace = 0xA001
+    ExifImageWidth = 0xA002
+    ExifImageHeight = 0xA003
+    ExposureMode = 0xA402
+    WhiteBalance = 0xA403
+    SceneCaptureType = 0xA406
+    BodySerialNumber = 0xA431
+    LensModel = 0xA434
+
+
+class GPS:
+    """The tags of the GPS IFD, which are written."""
+    GPSVersionID = 0x0000
+    GPSLatitudeRef = 0x0001
+    GPSLatitude = 0x0002
+    GPSLongitudeRef = 0x0003
+    GPSLongitude = 0x0004
+    GPSAltitudeRef = 0x0005
+    GPSAltitude = 0x0006
+    GPSTimeStamp = 0x0007
+    GPSDateStamp = 0x001D
+
+
+class Profile(NamedTuple):
+    """The size of the images of a camera and the bytes of its maker note."""
+    name: str
+    width: int
+    height: int
+    maker_note: int
+
+
+#from a small image up to the 12 megapixels of a phone
+PROFILES = (Profile("small", 1024, 768, 1024),
+    Profile("medium", 2048, 1536, 8192),
+    Profile("large", 4000, 3000, 32768))
+
+CAMERAS = (("Canon", "Canon EOS R6"), ("NIKON CORPORATION", "NIKON Z 6_2"),
+    ("SONY", "ILCE-7M3"), ("Apple", "iPhone 13"))
+
+
+def pixels(width, height, rng) -> np.ndarray:
+    """
+    Returns smooth gradients with some noise, which compress like a photo.
+    """
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    phase = rng.uniform(0, 6.28, 3)
+    channels = [127 + 100 * np.sin(x / width * (3 + i) + y / height * (2 + i) + phase[i])
+        for i in range(3)]
+    img = np.stack(channels, axis=-1) + rng.normal(0, 6, (height, width, 3))
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def exif(index, profile, rnd) -> Image.Exif:
+    """
+    Returns the tags of a camera in the image, the capture and the GPS IFD.
+    """
+    make, model = CAMERAS[index % len(CAMERAS)]
+    time = f"2025:{1 + index % 12:02d}:{1 + index % 28:02d} {index % 24:02d}:{index % 60:02d}:00"
+
+    tags = Image.Exif()
+    tags[Base.Make] = make
+    tags[Base.Model] = model
+    tags[Base.Software] = "Firmware 1.2.0"
+    tags[Base.Artist] = "Synthetic"
+    tags[Base.Copyright] = "Public Domain"
+    tags[Base.DateTime] = time
+    tags[Base.Orientation] = 1
+    tags[Base.XResolution] = IFDRational(72, 1)
+    tags[Base.YResolution] = IFDRational(72, 1)
+    tags[Base.ResolutionUnit] = 2
+    tags[Base.YCbCrPositioning] = 1
+
+    capture = tags.get_ifd(IFD.Exif)
+    capture[Base.ExposureTime] = IFDRational(1, rnd.choice((60, 125, 250, 500, 1000)))
+    capture[Base.FNumber] = IFDRational(rnd.choice((18, 28, 40, 56, 80)), 10)
+    capture[Base.ExposureProgram] = 2
+    capture[Base.ISOSpeedRatings] = rnd.choice((100, 200, 400, 800, 3200))
+    capture[Base.DateTimeOriginal] = time
+    capture[Base.DateTimeDigitized] = time
+    capture[Base.OffsetTimeOriginal] = "+02:00"
+    capture[Base.ShutterSpeedValue] = IFDRational(rnd.randint(5, 10), 1)
+    capture[Base.ApertureValue] = IFDRational(rnd.randint(2, 6), 1)
+    capture[Base.ExposureBiasValue] = IFDRational(0, 1)
+    capture[Base.MeteringMode] = 5
+    capture[Base.Flash] = 16
+    capture[Base.FocalLength] = IFDRational(rnd.choice((24, 35, 50, 85)), 1)
+    capture[Base.MakerNote] = rnd.randbytes(profile.maker_note)
+    capture[Base.UserComment] = b"ASCII\0\0\0synthetic corpus"
+    capture[Base.SubsecTimeOriginal] = f"{index % 100:02d}"
+    capture[Base.ColorSpace] = 1
+    capture[Base.ExifImageWidth] = profile.width
+    capture[Base.ExifImageHeight] = profile.height
+    capture[Base.ExposureMode] = 0
+    capture[Base.WhiteBalance] = 0
+    capture[Base.SceneCaptureType] = 0
+    capture[Base.LensModel] = "RF24-105mm F4 L IS USM"
+    capture[Base.BodySerialNumber] = f"{index:012d}"
+
+    gps = tags.get_ifd(IFD.GPSInfo)
+    gps[GPS.GPSVersionID] = b"\x02\x03\x00\x00"
+    gps[GPS.GPSLatitudeRef] = "N"
+    gps[GPS.GPSLatitude] = (float(rnd.randint(35, 60)), float(rnd.randint(0, 59)),
+        round(rnd.uniform(0, 59), 2))
+    gps[GPS.GPSLongitudeRef] = "E"
+    gps[GPS.GPSLongitude] = (float(rnd.randint(0, 30)), float(rnd.randint(0, 59)),
+        round(rnd.uniform(0, 59), 2))
+    gps[GPS.GPSAltitudeRef] = 0
+    gps[GPS.GPSAltitude] = IFDRational(rnd.randint(0, 3000), 1)
+    gps[GPS.GPSTimeStamp] = (float(index % 24), float(index % 60), 0.0)
+    gps[GPS.GPSDateStamp] = time[:10]
+    return tags
+
+
+def image(index, profile, seed = 0) -> bytes:
+    """
+    Returns the JPEG of the image with the index in the corpus.
+    """
+    rnd = random.Random(seed * 100003 + index)
+    rng = np.random.default_rng(seed * 100003 + index)
+    buf = io.BytesIO()
+    Image.fromarray(pixels(profile.width, profile.height, rng)).save(buf, "JPEG",
+        exif=exif(index, profile, rnd).tobytes(), quality=90)
+    return buf.getvalue()
+
+
+def generate(directory, count = 10, profiles = PROFILES, seed = 0) -> List[str]:
+    """
+    Writes count images of every profile into the directory and returns their paths.
+    Images, which already exist, are kept, so a corpus is generated only once.
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for profile in profiles:
+        for index in range(count):
+            path = os.path.join(directory, f"{profile.name}_{seed}_{index:04d}.jpg")
+            if not os.path.exists(path):
+                with open(path, "wb") as file:
+                    file.write(image(index, profile, seed))
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic corpus of JPEG images.")
+    parser.add_argument("directory")
+    parser.add_argument("--count", type=int, default=10, help="images per profile")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = generate(args.directory, args.count, seed=args.seed)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"{len(paths)} images, {size / 2**20:.1f} MiB in {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
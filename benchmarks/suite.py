@@ -0,0 +1,218 @@
+"""
+Measures the hot paths of reading, converting, grouping and writing the tags on a synthetic
+corpus and stores the results as JSON, so that versions can be compared to catch regressions.
+
+python3 -m benchmarks.suite --output before.json
+python3 -m benchmarks.suite --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple
+
+from benchmarks import corpus
+from exif_edit.converter import Converter
+from exif_edit.formats import DegreeFormatFactory, TimeStamp
+from exif_edit.image_io import Reader, Writer
+
+
+#the default share, which a case may become slower, before it is reported as a regression
+THRESHOLD = 0.1
+
+
+class Case(NamedTuple):
+    """
+    A measured function. The setup returns the arguments of the function for an image,
+    it is called again before every run, if the function changes its arguments.
+    """
+    name: str
+    setup: Callable
+    func: Callable
+    number: int = 1
+    fresh: bool = False
+
+
+def raw_dict(path) -> dict:
+    """
+    Returns the values of the image as they come from the exif library.
+    """
+    reader = Reader(path, header_only=True)
+    return {key: reader.binary().get(key) for key in reader.keys()}
+
+
+def edited_rows(path, out) -> tuple:
+    """
+    Returns the arguments to save the image with one changed tag.
+    """
+    reader = Reader(path, header_only=True)
+    dic = reader.dict()
+    rows = Converter.to_list({**dic, "artist": "Benchmark"})
+    return Writer(reader.binary(), dic, reader.path, reader.segment), rows, out
+
+
+def saved(writer, rows, out):
+    """
+    Saves the rows with the writer.
+    """
+    return writer.save(rows, out)
+
+
+def cases(out) -> List[Case]:
+    """
+    Returns the cases measured for every image, the written images go to the path out.
+    """
+    return [Case("reader.init", lambda p: (p,), Reader, 5),
+        Case("reader.init_header", lambda p: (p, True), Reader, 20),
+        Case("reader.dict", lambda p: (Reader(p, True),), Reader.dict, 20),
+        Case("converter.group_dict", lambda p: (Reader(p, True).dict(),), Converter.group_dict, 500),
+        Case("converter.to_format", lambda p: (raw_dict(p),), Converter.to_format_many, 100),
+        Case("converter.to_exif", lambda p: (Reader(p, True).dict(),), Converter.to_exif_many, 100),
+        Case("writer.save", lambda p: edited_rows(p, out), saved, fresh=True)]
+
+
+def texts(count = 10000) -> Dict[str, list]:
+    """
+    Returns unique texts for every parser, more than its cache holds.
+    """
+    return {"formats.parse_dms": [f"{i % 90}°{i % 60}'{i % 6000 / 100}\"" for i in range(count)],
+        "formats.parse_decimal": [f"{i % 90}.{i:05d}°" for i in range(count)],
+        "formats.parse_timestamp": [f"{i % 24}:{i % 60}:{i % 6000 / 100}" for i in range(count)]}
+
+
+PARSERS = {"formats.parse_dms": DegreeFormatFactory.parse,
+    "formats.parse_decimal": DegreeFormatFactory.parse,
+    "formats.parse_timestamp": TimeStamp.parse}
+
+
+def summary(times) -> dict:
+    """
+    Returns the best and the median time of a call in milliseconds.
+    """
+    return {"best_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000,
+        "runs": len(times)}
+
+
+def measure(case, paths, repeat) -> dict:
+    """
+    Returns the summary of the time per call of the case over all images.
+    """
+    times = []
+    for path in paths:
+        args = case.setup(path)
+        for _ in range(repeat):
+            if case.fresh:
+                args = case.setup(path)
+            begin = time.perf_counter()
+            for _ in range(case.number):
+                case.func(*args)
+            times.append((time.perf_counter() - begin) / case.number)
+    return summary(times)
+
+
+def parse(name, values, repeat) -> dict:
+    """
+    Returns the summary of the time per call of the parser over the values.
+    """
+    func = PARSERS[name]
+    times = []
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        for value in values:
+            func(value)
+        times.append((time.perf_counter() - begin) / len(values))
+    return summary(times)
+
+
+def commit() -> str:
+    """
+    Returns the current commit of the repository, or None outside of git.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(directory, count = 3, repeat = 5, seed = 0) -> dict:
+    """
+    Runs all cases on every profile of the corpus and returns the results with the environment.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "saved.jpg")
+        for profile in corpus.PROFILES:
+            paths = corpus.generate(directory, count, (profile,), seed)
+            for case in cases(out):
+                results[f"{case.name}/{profile.name}"] = measure(case, paths, repeat)
+    for name, values in texts().items():
+        results[name] = parse(name, values, repeat)
+
+    return {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit(), "python": platform.python_version(), "platform": platform.platform(),
+        "corpus": {"count": count, "seed": seed, "repeat": repeat}, "results": results}
+
+
+def compare(current, baseline, threshold = THRESHOLD) -> List[str]:
+    """
+    Returns the names of the cases, whose best time is slower than the baseline by more than the
+    threshold. The best time is compared, because it is the least disturbed by other processes.
+    Cases, which are only in one of the results, are not compared.
+    """
+    return [name for name, res in current["results"].items() if name in baseline["results"]
+        and res["best_ms"] > baseline["results"][name]["best_ms"] * (1 + threshold)]
+
+
+def report(current, baseline = None):
+    """
+    Prints a line for every case, with the change to the baseline if there is one.
+    """
+    print(f"{'case':<36} {'best ms':>10} {'median ms':>10}" + (f" {'change':>8}" if baseline else ""))
+    for name, res in current["results"].items():
+        line = f"{name:<36} {res['best_ms']:>10.4f} {res['median_ms']:>10.4f}"
+        old = baseline["results"].get(name) if baseline else None
+        if old:
+            line += f" {res['best_ms'] / old['best_ms'] - 1:>+8.1%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the benchmarks of the hot paths.")
+    parser.add_argument("--corpus", default=os.path.join(tempfile.gettempdir(), "exif_edit_corpus"),
+        help="directory of the synthetic images, they are generated once")
+    parser.add_argument("--count", type=int, default=3, help="images per profile")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="file to store the results as JSON")
+    parser.add_argument("--compare", help="results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+        help="share, which the best time may become slower")
+    args = parser.parse_args()
+
+    current = run(args.corpus, args.count, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(current, file, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    report(current, baseline)
+
+    if baseline:
+        slower = compare(current, baseline, args.threshold)
+        if slower:
+            print(f"regressions over {args.threshold:.0%}: {', '.join(slower)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
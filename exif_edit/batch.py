@@ -0,0 +1,202 @@
+"""
+Module to edit the Exif tags of many images without the GUI.
+"""
+import glob
+import os
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+from exif_edit.converter import Converter
+from exif_edit.image_io import Reader, Writer
+from exif_edit.tags import TAGS
+
+
+class Edits:
+    """The tags to assign and to delete on every image of a batch."""
+
+    def __init__(self, assign = None, delete = ()):
+        self.assign = {} if assign is None else assign
+        self.delete = tuple(delete)
+        #the values are the same for every image, so they are converted only once
+        self.formatted = {}
+        for key, value in self.assign.items():
+            try:
+                self.formatted[key] = Converter.to_format(key, value)
+            except ValueError as exc:
+                raise ValueError(f"can't set {key} ({exc})") from exc
+
+    @classmethod
+    def parse(cls, assignments, deletions):
+        """
+        Creates the edits from a list of 'key=value' assignments and a list of keys to delete.
+        The whitespace around the keys and values is removed.
+        Raises a ValueError if an assignment is malformed or a tag can not be changed.
+        """
+        assign = {}
+        for assignment in assignments:
+            key, sep, value = assignment.partition("=")
+            key = key.strip()
+            if not sep or not key:
+                raise ValueError(f"expected key=value, got: {assignment}")
+            assign[key] = value.strip()
+
+        keys = [key.strip() for key in deletions]
+        if not all(keys):
+            raise ValueError("expected a key to delete")
+        return cls.checked(assign, keys)
+
+    @classmethod
+    def checked(cls, assign, deletions):
+        """
+        Creates the edits after checking them with the rules of the Writer.
+        Raises a ValueError if a tag is read only or can not be deleted.
+        """
+        for key in assign:
+            if TAGS.is_read_only(key):
+                raise ValueError(f"tag is read only: {key}")
+
+        for key in deletions:
+            if TAGS.is_locked(key):
+                raise ValueError(f"tag can not be deleted: {key}")
+
+        return cls(assign, deletions)
+
+    def apply(self, dic) -> dict:
+        """
+        Returns a new dictionary, which is the given one with the edits applied.
+        Texts are converted to the type of the tag's value in the dictionary.
+        Raises a ValueError if a text does not fit that type.
+        """
+        rows = dict(dic)
+        for key in self.delete:
+            rows.pop(key, None)
+        for key, value in self.formatted.items():
+            try:
+                rows[key] = Converter.coerce(key, value, dic.get(key))
+            except ValueError as exc:
+                raise ValueError(f"can't set {key} ({exc})") from exc
+        return rows
+
+
+class Result(NamedTuple):
+    """The outcome of processing a single image."""
+    path: str
+    status: str
+    elapsed: float
+    error: Optional[str] = None
+
+    def failed(self) -> bool:
+        """
+        Returns True if the image could not be processed.
+        """
+        return self.error is not None
+
+
+def edit_file(path, edits) -> Result:
+    """
+    Applies the edits to the image at the given path and saves it in place.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    start = time.perf_counter()
+    try:
+        reader = Reader(path, header_only=True)
+        dic = reader.dict()
+        rows = Converter.to_list(edits.apply(dic))
+        writer = Writer(reader.binary(), dic, reader.path, reader.segment)
+        status = "saved" if writer.save(rows, path) else "unchanged"
+        return Result(path, status, time.perf_counter() - start)
+    except Exception as exc:
+        return Result(path, "failed", time.perf_counter() - start, str(exc))
+
+
+def edit_item(item) -> Result:
+    """
+    Applies the edits of the item, which is a tuple of the path and the edits for this image.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    path, edits = item
+    return edit_file(path, edits)
+
+
+class Batch:
+    """Runs a task for many images on a pool of processes."""
+
+    extensions = (".jpg", ".jpeg")
+
+    def __init__(self, workers = None):
+        self.workers = os.cpu_count() if workers is None else max(1, workers)
+
+    @classmethod
+    def files(cls, paths) -> Iterator[str]:
+        """
+        Yields the images found in the given files, directories or glob patterns.
+        Directories are searched recursively, a leading ~ is the user's home.
+        """
+        for path in map(os.path.expanduser, paths):
+            if os.path.isdir(path):
+                yield from cls.__walk(path)
+            elif os.path.isfile(path):
+                yield path
+            else:
+                for match in sorted(glob.iglob(path, recursive=True)):
+                    if os.path.isdir(match):
+                        yield from cls.__walk(match)
+                    elif cls.is_image(match):
+                        yield match
+
+    @staticmethod
+    def unmatched(paths) -> list:
+        """
+        Returns the given files, directories or glob patterns, which don't exist or match nothing.
+        """
+        def matches(path):
+            path = os.path.expanduser(path)
+            return os.path.exists(path) or next(glob.iglob(path, recursive=True), None) is not None
+        return [path for path in paths if not matches(path)]
+
+    @classmethod
+    def __walk(cls, directory):
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                if entry.is_dir(follow_symlinks=False):
+                    yield from cls.__walk(entry.path)
+                elif entry.is_file() and cls.is_image(entry.name):
+                    yield entry.path
+
+    @classmethod
+    def is_image(cls, path) -> bool:
+        """
+        Returns True if the path has the extension of a supported image.
+        """
+        return path.lower().endswith(cls.extensions)
+
+    def map(self, func: Callable, items: Iterable, *args) -> Iterator:
+        """
+        Calls the function for every item on the pool and yields the results as they complete.
+        Only a few tasks per worker are in flight at any time, so the items may be a lazy
+        iterator of any length.
+        """
+        if self.workers == 1:
+            for item in items:
+                yield func(item, *args)
+            return
+
+        limit = self.workers * 4
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            for item in items:
+                pending.add(executor.submit(func, item, *args))
+                if len(pending) >= limit:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            for future in as_completed(pending):
+                yield future.result()
+
+    def edit(self, paths, edits) -> Iterator[Result]:
+        """
+        Applies the edits to every image found in the paths.
+        """
+        return self.map(edit_file, self.files(paths), edits)
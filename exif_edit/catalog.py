@@ -0,0 +1,263 @@
+"""
+Module for a persistent catalog of the Exif tags of a whole library.
+"""
+import json
+import os
+import sqlite3
+import time
+
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from exif_edit.batch import Batch
+from exif_edit.image_io import Reader
+from exif_edit.location import Coordinate
+from exif_edit.tags import TIME_FORMAT, TIME_KEYS
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    taken TEXT,
+    make TEXT COLLATE NOCASE,
+    model TEXT COLLATE NOCASE,
+    latitude REAL,
+    longitude REAL,
+    tags TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_taken ON images (taken);
+CREATE INDEX IF NOT EXISTS images_make ON images (make, taken);
+CREATE INDEX IF NOT EXISTS images_model ON images (model, taken);
+CREATE INDEX IF NOT EXISTS images_location ON images (latitude, longitude);
+"""
+
+
+class Entry(NamedTuple):
+    """The row of an image in the catalog."""
+    path: str
+    mtime_ns: int
+    size: int
+    taken: Optional[str]
+    make: Optional[str]
+    model: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
+    tags: str
+
+
+class Scan(NamedTuple):
+    """The numbers of images, which were handled by a scan."""
+    added: int
+    updated: int
+    unchanged: int
+    removed: int
+    failed: int
+    elapsed: float
+
+
+def read_entry(path) -> Tuple[str, Optional[Entry], Optional[str]]:
+    """
+    Returns the path, the row of the image and the error, if the image could not be read.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    try:
+        stat = os.stat(path)
+        dic = Reader(path, header_only=True).grouped_dict()
+        lat, lon = Catalog.location(dic)
+        entry = Entry(path, stat.st_mtime_ns, stat.st_size, Catalog.taken(dic),
+            Catalog.text(dic.get("make")), Catalog.text(dic.get("model")), lat, lon,
+            json.dumps(dic, default=repr, ensure_ascii=False))
+        return path, entry, None
+    except Exception as exc:
+        return path, None, str(exc)
+
+
+class Catalog:
+    """
+    This class stores the grouped tags of every image in a SQLite database,
+    with indexed columns for the capture time, the camera and the location.
+    A rescan only reads the images, whose modification time or size changed.
+    """
+
+    #the number of images, which are written in one transaction
+    CHUNK = 500
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        """
+        Closes the database.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    @staticmethod
+    def taken(dic) -> Optional[str]:
+        """
+        Returns the capture time as 'YYYY-MM-DD HH:MM:SS', which can be compared as text.
+        """
+        for key in TIME_KEYS:
+            value = dic.get(key)
+            if value:
+                try:
+                    return datetime.strptime(str(value).strip(), TIME_FORMAT).isoformat(" ")
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def location(dic) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Returns the decimal latitude and longitude, or None for both.
+        """
+        coord = Coordinate.find(dic.get)
+        return (None, None) if coord is None else coord.decimal()
+
+    @staticmethod
+    def text(value) -> Optional[str]:
+        """
+        Returns the value as a stripped text, or None if it is empty.
+        """
+        if value is None:
+            return None
+        value = str(value).strip("\0 ")
+        return value or None
+
+    def stamps(self) -> dict:
+        """
+        Returns the modification time and size of every image in the catalog by its path.
+        """
+        return dict((row[0], (row[1], row[2])) for row in
+            self.connection.execute("SELECT path, mtime_ns, size FROM images"))
+
+    def update(self, paths: Iterable, batch = None) -> Tuple[int, int, int]:
+        """
+        Reads the given images and adds or replaces them in the catalog.
+        The images are committed in chunks while they are read, so that an interrupted scan
+        keeps what it has read so far and the memory doesn't grow with the library.
+        Returns the numbers of added, updated and failed images.
+        """
+        batch = Batch() if batch is None else batch
+        known = self.stamps()
+        entries = []
+        added = updated = failed = 0
+        for _, entry, _ in batch.map(read_entry, paths):
+            if entry is None:
+                failed += 1
+                continue
+            if entry.path in known:
+                updated += 1
+            else:
+                added += 1
+            entries.append(entry)
+            if len(entries) >= Catalog.CHUNK:
+                self.__insert(entries)
+                entries.clear()
+        self.__insert(entries)
+        return added, updated, failed
+
+    def __insert(self, entries):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", entries)
+
+    def remove(self, paths: Iterable) -> int:
+        """
+        Removes the images from the catalog and returns their number.
+        """
+        with self.connection:
+            cursor = self.connection.executemany("DELETE FROM images WHERE path = ?",
+                ((path,) for path in paths))
+        return cursor.rowcount
+
+    def scan(self, paths: Iterable, batch = None) -> Scan:
+        """
+        Adds or updates the images found in the files, directories or globs.
+        Images in the catalog, which no longer exist, are removed.
+        """
+        begin = time.perf_counter()
+        known = self.stamps()
+
+        changed = []
+        seen = set()
+        unchanged = 0
+        for path in Batch.files(paths):
+            path = os.path.abspath(path)
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                unchanged += 1
+            else:
+                changed.append(path)
+
+        added, updated, failed = self.update(changed, batch)
+        removed = self.remove([path for path in known
+            if path not in seen and not os.path.exists(path)])
+        return Scan(added, updated, unchanged, removed, failed, time.perf_counter() - begin)
+
+    def find(self, camera = None, year = None, since = None, until = None,
+        bbox = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        Returns the paths and capture times of the images, which match all given criteria,
+        ordered by the capture time. The camera is compared with the make and the model,
+        ignoring the case. Since and until are dates like '2025-05-01', until is inclusive.
+        The bbox is a tuple of south, west, north and east.
+        """
+        clauses, args = [], []
+        if camera is not None:
+            clauses.append("(make = ? OR model = ?)")
+            args += [camera, camera]
+        if year is not None:
+            since = max(since or "", f"{int(year):04d}")
+            until = min(until or "9999", f"{int(year):04d}-12-31")
+        if since:
+            clauses.append("taken >= ?")
+            args.append(since)
+        if until:
+            #the times of the given day, '~' sorts after every character of a time
+            clauses.append("taken <= ?")
+            args.append(until + "~")
+        if bbox is not None:
+            south, west, north, east = bbox
+            clauses.append("latitude BETWEEN ? AND ?")
+            args += [south, north]
+            if west <= east:
+                clauses.append("longitude BETWEEN ? AND ?")
+            else:
+                clauses.append("(longitude >= ? OR longitude <= ?)")
+            args += [west, east]
+
+        query = "SELECT path, taken FROM images"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY taken, path"
+        return self.connection.execute(query, args).fetchall()
+
+    def tags(self, path) -> Optional[dict]:
+        """
+        Returns the grouped tags of the image as they were stored, or None if it is unknown.
+        Custom formats are stored as their text.
+        """
+        row = self.connection.execute("SELECT tags FROM images WHERE path = ?",
+            (os.path.abspath(path),)).fetchone()
+        return None if row is None else json.loads(row[0])
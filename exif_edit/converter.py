@@ -4,81 +4,131 @@ Module for converting between UI and Exif data.
 from enum import Enum
 import logging
 
-from sortedcontainers import SortedDict
-import exif as ex
-
 from exif_edit.formats import DegreeFormatFactory, Format, TimeStamp
+from exif_edit.tags import TAGS
 
 
 class ExifFilter:
     """Filter for keys which should be handled different."""
 
+    __NOT_DELETEABLE = tuple(sorted(TAGS.not_deletable))
+    __READ_ONLY = tuple(sorted(TAGS.read_only))
+    __LOCKED = __NOT_DELETEABLE + __READ_ONLY
+
     @staticmethod
     def locked():
         """This method joins all filter into one."""
-        return ExifFilter.not_deleteable() + ExifFilter.read_only()
+        return ExifFilter.__LOCKED
 
     @staticmethod
     def not_deleteable():
         """Filter for attributes which are editable bot not deletable."""
-        return ("bits_per_sample", "compression",
-            "image_height", "image_width", "image_unique_id",
-            "jpeg_interchange_format", "jpeg_interchange_format_length",
-            "photometric_interpretation",
-            "resolution_unit",
-            "samples_per_pixel", "x_resolution", "y_resolution")
+        return ExifFilter.__NOT_DELETEABLE
 
     @staticmethod
     def read_only():
         """Filter for attributes which are read only."""
-        return "_exif_ifd_pointer", "_gps_ifd_pointer", "exif_version"
+        return ExifFilter.__READ_ONLY
 
 
 class Converter:
     """This class acts as a converter between the exif data and the data from the sheet."""
 
-    dictionary = {"color_space": ex.ColorSpace,
-            "exposure_mode": ex.ExposureMode,
-            "exposure_program": ex.ExposureProgram,
-            "gps_altitude_ref": ex.GpsAltitudeRef,
-            "light_source": ex.LightSource,
-            "metering_mode": ex.MeteringMode,
-            "orientation": ex.Orientation,
-            "resolution_unit": ex.ResolutionUnit,
-            "saturation": ex.Saturation,
-            "scene_capture_type": ex.SceneCaptureType,
-            "sensing_method": ex.SensingMethod,
-            "sharpness": ex.Sharpness,
-            "white_balance": ex.WhiteBalance}
+    #name to member, value to member and the fallback member for every enum
+    __enum_maps = {}
 
     @classmethod
     def keys(cls) -> list:
-        """Returns a list of keys from the dictionary."""
-        return list(cls.dictionary.keys())
+        """Returns a list of the keys, which have an enum."""
+        return list(TAGS.enums.keys())
+
+    @classmethod
+    def __enum_map(cls, enm) -> tuple:
+        maps = cls.__enum_maps.get(enm)
+        if maps is None:
+            members = list(enm)
+            maps = (dict(enm.__members__), {m.value: m for m in members}, members[0])
+            cls.__enum_maps[enm] = maps
+        return maps
 
     @classmethod
-    def __from_enum(cls, key, value):
-        enm = cls.dictionary[key]
+    def __from_enum(cls, enm, value):
+        names, values, fallback = cls.__enum_map(enm)
         try:
-            return enm(int(value))
-        except:
+            member = values.get(int(value))
+        except (TypeError, ValueError):
             #is the value a valid enum name?
-            if value in enm.__members__:
-                return enm[value]
-            #fallback to first enum value
-            return list(enm)[0]
+            member = names.get(value)
+        #fallback to first enum value
+        return fallback if member is None else member
 
     @classmethod
     def to_exif(cls, key, value):
         """Converts the value from the sheet to a exif conform type."""
         #do we have a matching enum in our dictionary?
-        if key in cls.dictionary:
-            return cls.__from_enum(key, value)
+        enm = TAGS.enum(key)
+        if enm is not None:
+            return cls.__from_enum(enm, value)
         #do we have a custom type?
         if isinstance(value, Format):
             return value.get_source()
         return value
 
+    @classmethod
+    def to_exif_many(cls, dic) -> dict:
+        """
+        Converts all values of the dictionary from the sheet to exif conform types.
+        """
+        return {key: cls.to_exif(key, value) for key, value in dic.items()}
+
+    @classmethod
+    def coerce(cls, key, value, origin = None):
+        """
+        Converts a text from the sheet or the command line to the type of the tag's value,
+        which is the type of the origin value, if there is one.
+        Enums become the name of their member, as they are shown.
+        Raises a ValueError if the text does not fit the type.
+        The text or list of an exported value is the origin itself.
+        """
+        if Converter.__is_exported(value, origin):
+            return origin
+        if not isinstance(value, str):
+            return value
+
+        text = value.strip()
+        enm = TAGS.enum(key)
+        if enm is not None:
+            names, values, _ = cls.__enum_map(enm)
+            member = values.get(int(text)) if text.isdigit() else names.get(text.upper())
+            if member is None:
+                raise ValueError(f"no {enm.__name__} value: {text}")
+            return member.name
+        if TAGS.formatter(key) is not None:
+            return Converter.to_format(key, text)
+
+        if isinstance(origin, (int, float)) and not isinstance(origin, bool):
+            kind = type(origin)
+        else:
+            kind = TAGS.value_type(key) if origin is None else None
+        if kind is int:
+            return int(text)
+        if kind is float:
+            numerator, sep, denominator = text.partition("/")
+            return float(numerator) / float(denominator) if sep else float(text)
+        return value
+
+    @staticmethod
+    def __is_exported(value, origin):
+        #CSV has the text of every value, JSON has lists instead of tuples,
+        #formats are compared by their text, the parsed ones have texts as source
+        if origin is None or isinstance(origin, str):
+            return False
+        if isinstance(value, Format):
+            value = repr(value)
+        if isinstance(value, list):
+            return isinstance(origin, tuple) and tuple(value) == origin
+        return isinstance(value, str) and value in (repr(origin), str(origin))
+
     @staticmethod
     def read_from_dict(dic, key):
         """
@@ -98,28 +148,34 @@ class Converter:
         """
         Converts value to existing custom formats.
         """
-        if Converter.is_gps_timestamp(key):
-            return TimeStamp.parse(value)
-        if Converter.is_geoloc(key):
-            return DegreeFormatFactory.create(value)
+        formatter = TAGS.formatter(key)
+        if formatter is not None:
+            return formatter(value)
         #human readable value if we have an enum
         if isinstance(value, Enum):
             return value.name
         return value
 
+    @staticmethod
+    def to_format_many(dic) -> dict:
+        """
+        Converts all values of the dictionary to existing custom formats.
+        """
+        return {key: Converter.to_format(key, value) for key, value in dic.items()}
+
     @staticmethod
     def is_geoloc(key) -> bool:
         """
         This function returns True if the key is related to a geo location, else False"
         """
-        return key in ("gps_longitude", "gps_latitude")
+        return TAGS.formatter(key) is DegreeFormatFactory.create
 
     @staticmethod
     def is_gps_timestamp(key) -> bool:
         """
         This function returns True if the key is related to a gps timestamp, else False"
         """
-        return key in ("gps_timestamp", )
+        return TAGS.formatter(key) is TimeStamp.parse
 
     @staticmethod
     def to_dict(rows) -> dict:
@@ -145,16 +201,8 @@ class Converter:
         """
         Groups the given dictionary, where every group is sorted.
         """
-        #sort elements seperately, which can only be read
-        read_only = SortedDict(Converter.__filter(dic, ExifFilter.read_only()))
-        #sort elements seperately, which can not be deleted
-        edit_only = SortedDict(Converter.__filter(dic, ExifFilter.not_deleteable()))
-        #join the dictionaries
-        return read_only | edit_only | SortedDict(dic)
-
-    @staticmethod
-    def __filter(dic, fltr):
-        """
-        Remove elements from dictionary to avoid sorting them in the big one.
-        """
-        return [(k, dic.pop(k)) for k in fltr if k in dic]
+        #read only first, then the ones which can not be deleted, then the rest
+        groups = ([], [], [])
+        for key in dic:
+            groups[TAGS.group(key)].append(key)
+        return {k: dic[k] for group in groups for k in sorted(group)}
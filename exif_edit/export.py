@@ -0,0 +1,103 @@
+"""
+Module to export the Exif tags of whole directory trees as CSV or JSON Lines.
+"""
+import csv
+import json
+
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from exif_edit.batch import Batch
+from exif_edit.formats import Format
+from exif_edit.image_io import Reader
+
+
+def serialize(value):
+    """
+    Returns the value as it is exported, custom formats as their text.
+    """
+    if isinstance(value, Format):
+        return repr(value)
+    return value
+
+
+def read_tags(path) -> Tuple[str, Optional[dict], Optional[str]]:
+    """
+    Returns the path, the exported tags of the image and the error, if it could not be read.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    try:
+        dic = Reader(path, header_only=True).dict()
+        return path, {key: serialize(value) for key, value in dic.items()}, None
+    except Exception as exc:
+        return path, None, str(exc)
+
+
+class Summary(NamedTuple):
+    """The numbers of exported images, rows and images which failed."""
+    images: int
+    rows: int
+    failed: int
+
+
+class Exporter:
+    """
+    This class streams the tags of the images to a file. The paths are walked lazily and
+    only a few images per worker are read at any time, so the memory does not grow with the
+    size of the tree. The rows are written in the order the images are read.
+    """
+
+    CSV = "csv"
+    JSONL = "jsonl"
+    HEADER = ("path", "key", "value")
+
+    def __init__(self, batch = None, on_error = None):
+        """
+        The function on_error is called with the path and the error of an image,
+        which could not be read.
+        """
+        self.batch = Batch() if batch is None else batch
+        self.on_error = on_error
+
+    def tags(self, paths: Iterable) -> Iterator[Tuple[str, Optional[dict], Optional[str]]]:
+        """
+        Yields the path, the exported tags and the error of every image found in the files,
+        directories or globs.
+        """
+        return self.batch.map(read_tags, Batch.files(paths))
+
+    def export(self, paths: Iterable, file, fmt = CSV) -> Summary:
+        """
+        Writes the tags to the open text file. CSV has a row of path, key and value for
+        every tag, JSON Lines has an object with the path and the tags for every image.
+        """
+        if fmt == Exporter.CSV:
+            writer = csv.writer(file)
+            writer.writerow(Exporter.HEADER)
+            def write(path, dic):
+                writer.writerows((path, key, Exporter.__text(value)) for key, value in dic.items())
+                return len(dic)
+        elif fmt == Exporter.JSONL:
+            def write(path, dic):
+                file.write(json.dumps({"path": path, "tags": dic}, default=repr, ensure_ascii=False))
+                file.write("\n")
+                return 1
+        else:
+            raise ValueError(f"unknown format: {fmt}")
+
+        images = rows = failed = 0
+        for path, dic, error in self.tags(paths):
+            if dic is None:
+                failed += 1
+                if self.on_error is not None:
+                    self.on_error(path, error)
+            else:
+                images += 1
+                rows += write(path, dic)
+        return Summary(images, rows, failed)
+
+    @staticmethod
+    def __text(value):
+        #a cell of CSV is always text
+        if isinstance(value, (bytes, tuple, list)):
+            return repr(value)
+        return value
@@ -0,0 +1,67 @@
+"""
+Module to browse through the images of a folder.
+"""
+import os
+
+from typing import List, Optional
+
+from exif_edit.batch import Batch
+
+
+class Folder:
+    """This class keeps the images of a folder in order and the position of the current one."""
+
+    def __init__(self, directory, current = None):
+        """
+        The folder starts with the given image or else with the first one.
+        """
+        self.directory = directory
+        self.images = Folder.list_images(directory)
+        self.index = 0
+        self.step = 1
+        if current is not None:
+            path = os.path.join(directory, os.path.basename(current))
+            if path in self.images:
+                self.index = self.images.index(path)
+
+    @staticmethod
+    def list_images(directory) -> List[str]:
+        """
+        Returns the sorted paths of the images in the directory, without sub directories.
+        """
+        with os.scandir(directory) as entries:
+            return sorted(e.path for e in entries if e.is_file() and Batch.is_image(e.name))
+
+    def current(self) -> Optional[str]:
+        """
+        Returns the path of the current image or None if the folder has no images.
+        """
+        return self.images[self.index] if self.images else None
+
+    def next(self) -> Optional[str]:
+        """
+        Moves to the next image and returns its path, or None if the current one is the last.
+        """
+        return self.__move(1)
+
+    def previous(self) -> Optional[str]:
+        """
+        Moves to the previous image and returns its path, or None if the current one is the first.
+        """
+        return self.__move(-1)
+
+    def __move(self, step):
+        index = self.index + step
+        if 0 <= index < len(self.images):
+            self.index = index
+            self.step = step
+            return self.images[index]
+        return None
+
+    def upcoming(self, count) -> List[str]:
+        """
+        Returns the paths of the next images in the direction of the last move.
+        """
+        if self.step > 0:
+            return self.images[self.index + 1:self.index + 1 + count]
+        return self.images[max(0, self.index - count):self.index][::-1]
@@ -1,16 +1,70 @@
 """
 This module contains custom formats used in the GUI.
 """
+import functools
 import re
 from typing import List, Tuple
 
 
+DMS_PATTERN = re.compile(r"(\d+)°(\d+)\'(\d+.?\d*)\"")
+DEC_PATTERN = re.compile(r"(\d+.?\d*)°?")
+TIME_PATTERN = re.compile(r"(\d+):(\d+):(\d+)")
+
+
+def is_number(text) -> bool:
+    """
+    Returns True if the text consists of digits with an optional fraction.
+    """
+    integer, _, fraction = text.partition(".")
+    return integer.isdecimal() and (not fraction or fraction.isdecimal())
+
+
 class Format:
     """
-    Parent class for every format.
+    Parent class for every format. A format is immutable, so that equal values can share
+    one instance, see intern().
     """
+    __slots__ = ("source",)
+
+    #maximal number of interned instances, the table starts over when it is full
+    INTERN_LIMIT = 65536
+    __interned = {}
+
     def __init__(self, source):
-        self.source = source
+        object.__setattr__(self, "source", source)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), (self.source,)
+
+    def ident(self) -> tuple:
+        """
+        Returns what makes the format unique, equal formats have the same ident.
+        """
+        return type(self), self.source
+
+    @staticmethod
+    def intern(fmt):
+        """
+        Returns the instance in use, which is equal to the given format, or else the format itself.
+        """
+        interned = Format.__interned
+        try:
+            ident = fmt.ident()
+            return interned[ident]
+        except KeyError:
+            if len(interned) >= Format.INTERN_LIMIT:
+                interned.clear()
+            interned[ident] = fmt
+            return fmt
+        except TypeError:
+            #the source is not hashable
+            return fmt
 
     def get_source(self):
         """
@@ -18,15 +72,29 @@ class Format:
         """
         return self.source
 
+    def __eq__(self, other):
+        return isinstance(other, Format) and self.ident() == other.ident()
+
+    def __hash__(self):
+        return hash(self.ident())
+
 class TimeStamp(Format):
     """
     A time stamp made from a tupel.
     """
+    __slots__ = ("sepr",)
+
     def __init__(self, val, separator = ':'):
         if len(val) != 3:
             raise ValueError("expected (hour, minuntes, seconds)")
         super().__init__((int(val[0]), int(val[1]), int(val[2])))
-        self.sepr = separator
+        object.__setattr__(self, "sepr", separator)
+
+    def __reduce__(self):
+        return TimeStamp, (self.source, self.sepr)
+
+    def ident(self) -> tuple:
+        return TimeStamp, self.source, self.sepr
 
     def __repr__(self) -> str:
         return f"{self.source[0]:02d}{self.sepr}{self.source[1]:02d}{self.sepr}{self.source[2]:02d}"
@@ -36,10 +104,30 @@ class TimeStamp(Format):
         """
         This function tries to create a new instance of a TimeStamp based on the given value.
         """
-        if isinstance(value, (List, Tuple)):
-            return TimeStamp(value)
+        if isinstance(value, (list, tuple)):
+            return Format.intern(TimeStamp(value))
+        if isinstance(value, str):
+            return TimeStamp.__parse_text(value)
+
+        return Format.intern(TimeStamp.search(value))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def __parse_text(text):
+        #fast path for the usual hh:mm:ss
+        parts = text.split(":")
+        if len(parts) == 3 and parts[0].isdecimal() and parts[1].isdecimal() \
+            and parts[2].isdecimal():
+            return TimeStamp(parts)
+
+        return TimeStamp.search(text)
 
-        match = re.search(r"(\d+):(\d+):(\d+)", str(value))
+    @staticmethod
+    def search(value):
+        """
+        This function searches the value for a time stamp with a regular expression.
+        """
+        match = TIME_PATTERN.search(str(value))
         if match:
             return TimeStamp((match.group(1), match.group(2), match.group(3)))
 
@@ -50,6 +138,8 @@ class DegreeFormat(Format):
     """
     Format for a degree.
     """
+    __slots__ = ()
+
     def as_float(self) -> float:
         """
         This will return the value as a single float number.
@@ -64,6 +154,8 @@ class DmsFormat(DegreeFormat):
     """
     Degree given in DMS format.
     """
+    __slots__ = ()
+
     def __init__(self, degrees):
         if len(degrees) != 3:
             raise ValueError("expected (degree, minuntes, seconds)")
@@ -93,6 +185,8 @@ class DecimalFormat(DegreeFormat):
     """
     Degree given in Decimal format.
     """
+    __slots__ = ()
+
     def __init__(self, degree):
         if degree is None:
             raise ValueError("expected degree in decimal")
@@ -129,9 +223,9 @@ class DegreeFormatFactory:
             return degrees
 
         if isinstance(degrees, (List, Tuple)):
-            return DmsFormat(degrees)
+            return Format.intern(DmsFormat(degrees))
         if isinstance(degrees, (float, int)):
-            return DecimalFormat(degrees)
+            return Format.intern(DecimalFormat(degrees))
         if isinstance(degrees, str):
             return DegreeFormatFactory.parse(degrees)
 
@@ -142,13 +236,44 @@ class DegreeFormatFactory:
         """
         Read a string and returns a matching format.
         """
+        return DegreeFormatFactory.__parse_text(str(arg))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def __parse_text(text):
+        #the formats are immutable, so the same text can return the same instance
+        return DegreeFormatFactory.__split(text)
+
+    @staticmethod
+    def __split(text):
+        #fast path for the strings, which the formats create themselves
+        if text.endswith("\""):
+            deg, sep, rest = text.partition("°")
+            mnt, sep2, sec = rest.partition("\'")
+            sec = sec[:-1]
+            if sep and sep2 and deg.isdecimal() and mnt.isdecimal() and is_number(sec):
+                return DmsFormat((deg, mnt, sec))
+        elif text.endswith("°"):
+            #like the pattern, an integer followed by the degree sign is not taken
+            if "." in text and is_number(text[:-1]):
+                return DecimalFormat(text[:-1])
+        elif is_number(text):
+            return DecimalFormat(text)
+
+        return DegreeFormatFactory.search(text)
+
+    @staticmethod
+    def search(arg):
+        """
+        Read a string with regular expressions and returns a matching format.
+        """
         #DMS
-        match = re.search(r"(\d+)°(\d+)\'(\d+.?\d*)\"", str(arg))
+        match = DMS_PATTERN.search(str(arg))
         if match:
             return DmsFormat((match.group(1), match.group(2), match.group(3)))
 
         #DEC
-        match = re.search(r"(\d+.?\d*)°?", str(arg))
+        match = DEC_PATTERN.search(str(arg))
         if match:
             return DecimalFormat(match.group(1))
 
@@ -0,0 +1,78 @@
+"""
+Module to convert many coordinates at once with NumPy.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+class GeoArrays:
+    """
+    This class converts arrays of coordinates between DMS triples with references and
+    signed decimal degrees. The results are the same as converting every coordinate on its own.
+    """
+
+    @staticmethod
+    def to_decimal(dms, refs, positive) -> np.ndarray:
+        """
+        Converts an array of (degree, minutes, seconds) rows into decimal degrees.
+        A row is negative, when its reference is not the positive one, e.g. 'N' or 'E'.
+        """
+        dms = np.asarray(dms, dtype=float).reshape(-1, 3)
+        #degrees and minutes are whole numbers, like in DmsFormat
+        dec = np.abs(np.trunc(dms[:, 0])) + np.trunc(dms[:, 1]) / 60 + dms[:, 2] / 3600
+        dec = GeoArrays.round(dec, 6)
+        return np.where(np.asarray(refs) == positive, dec, -dec)
+
+    @staticmethod
+    def to_dms(decimal, positive, negative) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Converts an array of decimal degrees into (degree, minutes, seconds) rows
+        and the references, e.g. 'N' and 'S'.
+        """
+        decimal = np.asarray(decimal, dtype=float)
+        refs = np.where(decimal < 0, negative, positive)
+        dec = np.abs(decimal)
+        deg = np.trunc(dec)
+        mnt = np.trunc((dec - deg) * 60)
+        sec = GeoArrays.round((dec - deg - mnt / 60) * 3600, 6)
+        #unlike DecimalFormat.as_tuple(), seconds rounded up to a full minute are carried over
+        carry = sec >= 60
+        sec = np.where(carry, sec - 60, sec)
+        mnt = mnt + carry
+        carry = mnt >= 60
+        mnt = np.where(carry, mnt - 60, mnt)
+        deg = deg + carry
+        return np.stack((deg, mnt, sec), axis=-1), refs
+
+    @staticmethod
+    def round(values, digits) -> np.ndarray:
+        """
+        Rounds like the builtin round(). NumPy scales the values, which gives a different result
+        for some values close to a tie, those few are rounded by Python.
+        """
+        values = np.asarray(values, dtype=float)
+        res = np.round(values, digits)
+        scaled = values * 10.0 ** digits
+        ties = np.flatnonzero(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+        flat = res.reshape(-1)
+        for i in ties:
+            flat[i] = round(float(values.flat[i]), digits)
+        return res
+
+    @staticmethod
+    def decimal(latitudes, longitudes, lat_refs, lon_refs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the decimal latitudes and longitudes, like Coordinate.decimal() for every row.
+        """
+        return (GeoArrays.to_decimal(latitudes, lat_refs, 'N'),
+            GeoArrays.to_decimal(longitudes, lon_refs, 'E'))
+
+    @staticmethod
+    def dms(latitudes, longitudes) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the DMS latitudes, longitudes and their references for decimal degrees.
+        """
+        lat, lat_refs = GeoArrays.to_dms(latitudes, 'N', 'S')
+        lon, lon_refs = GeoArrays.to_dms(longitudes, 'E', 'W')
+        return lat, lon, lat_refs, lon_refs
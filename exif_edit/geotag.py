@@ -0,0 +1,198 @@
+"""
+Module to geotag many images from a GPX track.
+"""
+import xml.etree.ElementTree as ET
+
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from exif_edit.batch import Batch, Edits, Result, edit_item
+from exif_edit.geo_arrays import GeoArrays
+from exif_edit.image_io import Reader
+from exif_edit.tags import TIME_FORMAT, TIME_KEYS
+
+
+class Track:
+    """
+    This class holds the points of a track as arrays, which are sorted by time.
+    A location is looked up by binary search and interpolated between the two surrounding points.
+    """
+
+    def __init__(self, times, latitudes, longitudes):
+        """
+        The times are seconds since the epoch in UTC, the coordinates are decimal degrees.
+        """
+        times = np.asarray(times, dtype=float)
+        order = np.argsort(times, kind="stable")
+        self.times = times[order]
+        self.latitudes = np.asarray(latitudes, dtype=float)[order]
+        self.longitudes = np.asarray(longitudes, dtype=float)[order]
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def load(cls, source):
+        """
+        Reads the points of all tracks in a GPX file, given as a path or a file object.
+        Points without a time are skipped. The file is parsed incrementally,
+        so that large tracks do not need a tree in memory.
+        """
+        times, lats, lons = [], [], []
+        for _, elem in ET.iterparse(source, events=("end",)):
+            if Track.__local_name(elem.tag) != "trkpt":
+                continue
+            for child in elem:
+                if Track.__local_name(child.tag) == "time" and child.text:
+                    times.append(Track.parse_time(child.text))
+                    lats.append(float(elem.get("lat")))
+                    lons.append(float(elem.get("lon")))
+                    break
+            elem.clear()
+        return cls(times, lats, lons)
+
+    @staticmethod
+    def __local_name(tag):
+        #GPX 1.0 and 1.1 use different namespaces
+        return tag.rsplit("}", 1)[-1]
+
+    @staticmethod
+    def parse_time(text) -> float:
+        """
+        Returns the seconds since the epoch for an ISO 8601 time, which is UTC if no zone is given.
+        """
+        text = text.strip()
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        stamp = datetime.fromisoformat(text)
+        if stamp.tzinfo is None:
+            stamp = stamp.replace(tzinfo=timezone.utc)
+        return stamp.timestamp()
+
+    def locate(self, times, max_gap = 60.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the latitudes, longitudes and a mask of the times, which could be matched.
+        A time matches when a track point is at most max_gap seconds away.
+        Missing times are given as NaN and never match.
+        """
+        times = np.asarray(times, dtype=float)
+        count = len(self.times)
+        if count == 0:
+            nan = np.full(times.shape, np.nan)
+            return nan, nan.copy(), np.zeros(times.shape, dtype=bool)
+
+        idx = np.searchsorted(self.times, times, side="right")
+        before = np.clip(idx - 1, 0, count - 1)
+        after = np.clip(idx, 0, count - 1)
+        start = self.times[before]
+        span = self.times[after] - start
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(span > 0, (times - start) / span, 0.0)
+        weight = np.clip(weight, 0.0, 1.0)
+        lat = self.latitudes[before] + weight * (self.latitudes[after] - self.latitudes[before])
+        lon = self.longitudes[before] + weight * (self.longitudes[after] - self.longitudes[before])
+
+        gap = np.minimum(np.abs(times - start), np.abs(self.times[after] - times))
+        matched = gap <= max_gap
+        return lat, lon, matched
+
+
+def capture_time(path, offset = None) -> Tuple[str, Optional[float], Optional[str]]:
+    """
+    Returns the path, the capture time of the image in seconds since the epoch, or None if it
+    has no capture time, and the error, if the image could not be read.
+    The offset is the difference of the camera clock to UTC in seconds. If it is not given,
+    the offset in the Exif tags is used, or else the clock is taken as UTC.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    try:
+        reader = Reader(path, header_only=True)
+        if not reader.binary().has_exif:
+            return path, None, None
+        for key in TIME_KEYS:
+            value = reader.value(key)
+            if value:
+                stamp = datetime.strptime(str(value).strip(), TIME_FORMAT)
+                break
+        else:
+            return path, None, None
+
+        if offset is None:
+            offset = parse_offset(reader.value("offset_time_original"))
+        stamp = stamp.replace(tzinfo=timezone(timedelta(seconds=offset)))
+        return path, stamp.timestamp(), None
+    except Exception as exc:
+        return path, None, str(exc)
+
+
+def parse_offset(value) -> float:
+    """
+    Returns the seconds of an Exif offset like '+02:00', or 0 if there is none.
+    """
+    if not value:
+        return 0.0
+    text = str(value).strip()
+    sign = -1 if text.startswith("-") else 1
+    hours, _, minutes = text.lstrip("+-").partition(":")
+    try:
+        return sign * (int(hours) * 3600 + int(minutes or 0) * 60)
+    except ValueError:
+        return 0.0
+
+
+class Geotagger:
+    """
+    This class matches the capture times of images with a track and writes the GPS tags.
+    Reading and writing the images is done on a pool of processes, while the matching
+    of all images is a single array operation.
+    """
+
+    UNMATCHED = "unmatched"
+
+    def __init__(self, track, offset = None, max_gap = 60.0, batch = None):
+        """
+        The offset is the difference of the camera clock to UTC in seconds,
+        see capture_time().
+        """
+        self.track = track
+        self.offset = offset
+        self.max_gap = max_gap
+        self.batch = Batch() if batch is None else batch
+
+    def match(self, paths) -> List[Tuple[str, Optional[Tuple[float, float]], Optional[str]]]:
+        """
+        Returns the paths of the images with the decimal latitude and longitude,
+        or None if the image could not be matched, and the error if it could not be read.
+        """
+        found = {path: (stamp, error) for path, stamp, error
+            in self.batch.map(capture_time, paths, self.offset)}
+        ordered = [path for path in paths if path in found]
+        times = [np.nan if found[p][0] is None else found[p][0] for p in ordered]
+        lat, lon, matched = self.track.locate(times, self.max_gap)
+        return [(path, (lat[i], lon[i]) if matched[i] else None, found[path][1])
+            for i, path in enumerate(ordered)]
+
+    def tag(self, paths) -> Iterator[Result]:
+        """
+        Writes the GPS tags to every image found in the paths, which could be matched.
+        The images, which could not be matched, are not touched.
+        Images, which could not be read, are reported as failed.
+        """
+        matches = self.match(list(Batch.files(paths)))
+        located = [(path, coord) for path, coord, _ in matches if coord is not None]
+        for path, coord, error in matches:
+            if error is not None:
+                yield Result(path, "failed", 0.0, error)
+            elif coord is None:
+                yield Result(path, Geotagger.UNMATCHED, 0.0)
+
+        lat, lon, lat_refs, lon_refs = GeoArrays.dms([c[0] for _, c in located],
+            [c[1] for _, c in located])
+        items = [(path, Edits({"gps_latitude": tuple(lat[i].tolist()),
+            "gps_latitude_ref": str(lat_refs[i]),
+            "gps_longitude": tuple(lon[i].tolist()),
+            "gps_longitude_ref": str(lon_refs[i])})) for i, (path, _) in enumerate(located)]
+        yield from self.batch.map(edit_item, items)
@@ -2,6 +2,7 @@
 GUI of the application.
 """
 
+import os
 import sys
 import logging
 import tkinter as tk
@@ -12,9 +13,8 @@ from tkinter import ttk
 from idlelib import tooltip as tp
 from tksheet import Sheet
 
-from PIL import ImageTk as itk
-from PIL import Image
-
+from exif_edit.image_io import WriteError
+from exif_edit.loader import Loader, Prefetcher
 from exif_edit.mediator import Mediator
 
 
@@ -22,9 +22,15 @@ class App(tk.Tk):
 
     """This class contains the GUI. It uses a spreadsheet to display Exif Tags."""
 
+    #milliseconds between two checks for the results of the loader
+    POLL_INTERVAL = 20
+    #number of images in a folder, which are read ahead
+    PREFETCH_COUNT = 5
+
     def __init__(self):
         super().__init__()
         self.img_display = None
+        self.polling = False
 
         self.title("Exif Edit")
         self.grid_columnconfigure(0, weight = 1)
@@ -44,6 +50,8 @@ class App(tk.Tk):
             empty_horizontal=5, empty_vertical=5,
             height=500, width = 550)
         self.mediator = Mediator(self.sheet)
+        self.prefetcher = Prefetcher(self.mediator)
+        self.loader = Loader(self.mediator, prefetcher=self.prefetcher)
 
         self.__add_menubar()
         self.__add_toolbar()
@@ -54,6 +62,11 @@ class App(tk.Tk):
         menubar = tk.Menu(self)
         filemenu = tk.Menu(menubar)
         filemenu.add_command(label="Open", accelerator="Cmd+O", command=self.__open)
+        filemenu.add_command(label="Open Folder", accelerator="Cmd+Shift+O",
+            command=self.__open_folder)
+        filemenu.add_command(label="Next Image", accelerator="Cmd+Right", command=self.__next)
+        filemenu.add_command(label="Previous Image", accelerator="Cmd+Left",
+            command=self.__previous)
         filemenu.add_command(label="Save", accelerator="Cmd+S", command=self.__save)
         filemenu.add_separator()
         filemenu.add_command(label="Exit", accelerator="Cmd+W", command=self.__quit)
@@ -103,7 +116,7 @@ class App(tk.Tk):
         self.btn_loc.pack(side=tk.LEFT, padx=2, pady=5)
 
     def __icon(self, icon_name):
-        return self.mediator.read_icon(icon_name)
+        return self.mediator.icon_path(icon_name)
 
     @classmethod
     def __acc(cls, key):
@@ -133,12 +146,21 @@ class App(tk.Tk):
                                 ("end_edit_cell", self.__end_edit_cell),
                                 ("row_select", self.__row_select),
                                 ("deselect", self.__deselect),
-                                ("drag_select_rows", self.__drag_select_rows)
+                                ("drag_select_rows", self.__drag_select_rows),
+                                ("end_ctrl_v", self.__reindex),
+                                ("end_ctrl_x", self.__reindex),
+                                ("end_ctrl_z", self.__reindex),
+                                ("end_delete_key", self.__reindex),
+                                ("end_rc_insert_row", self.__reindex),
+                                ("end_rc_delete_row", self.__reindex)
                                 ])
 
     def __add_bindings(self):
         #add key bindings according to accelerators
         self.bind('<Command-o>', self.__open)
+        self.bind('<Command-O>', self.__open_folder)
+        self.bind('<Command-Right>', self.__next)
+        self.bind('<Command-Left>', self.__previous)
         self.bind('<Command-s>', self.__save)
         self.bind('<Command-w>', self.__quit)
         self.bind('<Command-l>', self.__open_location)
@@ -146,23 +168,62 @@ class App(tk.Tk):
     def load_image(self, img_path):
         """
         This method loads the image and the exif data into the application.
+        The image is read in the background, the table is filled first and the preview follows.
         """
         logging.info("loading image: %s", img_path)
 
-        self.mediator.append_exif(img_path)
+        self.loader.load(img_path)
+        if not self.polling:
+            self.polling = True
+            self.after(self.POLL_INTERVAL, self.__poll_loader)
+
+    def load_folder(self, directory, current = None):
+        """
+        This method opens the folder mode for the directory and loads its first image,
+        or the current one if given.
+        """
+        img_path = self.mediator.open_folder(directory, current)
+        if current is not None:
+            img_path = current
+        if img_path is not None:
+            self.__load_in_folder(img_path)
+
+    def __load_in_folder(self, img_path):
+        self.load_image(img_path)
+        self.prefetcher.prefetch(self.mediator.upcoming_images(self.PREFETCH_COUNT))
+
+    def __poll_loader(self):
+        for kind, img_path, value in self.loader.poll():
+            if kind == Loader.EXIF:
+                self.__show_exif(img_path, value)
+            elif kind == Loader.PREVIEW:
+                self.__show_preview(value)
+            else:
+                logging.error("can't load image %s: %s", img_path, value)
+
+        if self.loader.is_loading():
+            self.after(self.POLL_INTERVAL, self.__poll_loader)
+        else:
+            self.polling = False
+
+    def __show_exif(self, img_path, dic):
+        self.mediator.show_exif(img_path, dic)
 
         #destroy a possible previous instance to avoid a stack of images
         if self.img_display is not None:
             self.img_display.destroy()
-
-        img = itk.PhotoImage(self.mediator.read_image(img_path))
-        self.img_display = tk.Label(self.frame, image=img)
-        self.img_display.image = img
-        self.img_display.grid(row = 0, column = 1, padx=5, pady=5, sticky = "w")
+            self.img_display = None
 
         self.__update_buttons()
         #ensure that window has focus again
         self.focus_set()
+
+    def __show_preview(self, preview):
+        from PIL import ImageTk as itk
+        img = itk.PhotoImage(preview)
+        self.img_display = tk.Label(self.frame, image=img)
+        self.img_display.image = img
+        self.img_display.grid(row = 0, column = 1, padx=5, pady=5, sticky = "w")
         self.__center()
 
     def single_select(self, event):
@@ -178,6 +239,10 @@ class App(tk.Tk):
         self.mediator.end_edit_cell((event[0], event[1]))
         self.__update_buttons()
 
+    def __reindex(self, event = None):
+        self.mediator.reindex()
+        self.__update_buttons()
+
     def __deselect(self, event):
         self.__update_row_buttons(event)
 
@@ -222,10 +287,30 @@ class App(tk.Tk):
 
     def __open(self, event = None):
         name = filedialog.askopenfilename()
-        self.load_image(name)
+        if name:
+            #the other images in the folder are available for next and previous
+            self.load_folder(os.path.dirname(name), name)
+
+    def __open_folder(self, event = None):
+        name = filedialog.askdirectory()
+        if name:
+            self.load_folder(name)
+
+    def __next(self, event = None):
+        img_path = self.mediator.next_image()
+        if img_path is not None:
+            self.__load_in_folder(img_path)
+
+    def __previous(self, event = None):
+        img_path = self.mediator.previous_image()
+        if img_path is not None:
+            self.__load_in_folder(img_path)
 
     def __save(self, event = None):
-        self.mediator.save_exif()
+        try:
+            self.mediator.save_exif()
+        except WriteError as exc:
+            logging.error("can't save image: %s", exc)
 
     def __open_location(self, event = None):
         self.mediator.show_location()
@@ -237,15 +322,18 @@ class App(tk.Tk):
 class ToolbarButton(tk.Button):
     """
     Button for the toolbar.
+    Tk decodes the icon itself, Pillow is only needed for the faded icon of a disabled button.
+    That icon is created once, when the window is idle for the first time.
     """
-    def __init__(self, anchor, icon, tooltip, cmd, disabled=False):
-        self.icon = icon.convert("RGBA")
-        self.image = itk.PhotoImage(self.icon)
-        self.overlay = Image.new('RGBA', icon.size, (255, 255, 255, 0))
-        super().__init__(anchor, image=self.image, relief=tk.FLAT, command=cmd)
+    def __init__(self, anchor, icon_path, tooltip, cmd, disabled=False):
+        self.icon_path = icon_path
+        self.icon = tk.PhotoImage(file=icon_path)
+        self.faded = None
+        super().__init__(anchor, image=self.icon, relief=tk.FLAT, command=cmd)
         Tooltip(self, text=tooltip)
         if disabled:
-            self.disable()
+            self.config(state=DISABLED)
+            self.after_idle(self.__fade_if_disabled)
 
     def toggle_state(self, enabled=True):
         """
@@ -262,19 +350,28 @@ class ToolbarButton(tk.Button):
         Extended method to disable the button, it also changes the icon.
         """
         self.config(state=DISABLED)
-        img = Image.blend(self.icon, self.overlay, 0.3)
-        self.__config_image(itk.PhotoImage(img))
+        if self.faded is None:
+            self.faded = ToolbarButton.__fade(self.icon_path)
+        self.config(image=self.faded)
 
     def enable(self):
         """
         Extended method to enable the button, it restores the original icon.
         """
         self.config(state=NORMAL)
-        self.__config_image(itk.PhotoImage(self.icon))
+        self.config(image=self.icon)
+
+    def __fade_if_disabled(self):
+        if str(self.cget("state")) == DISABLED:
+            self.disable()
 
-    def __config_image(self, img):
-        self.image = img
-        self.config(image=self.image)
+    @staticmethod
+    def __fade(icon_path):
+        from PIL import Image
+        from PIL import ImageTk as itk
+        icon = Image.open(icon_path).convert("RGBA")
+        overlay = Image.new('RGBA', icon.size, (255, 255, 255, 0))
+        return itk.PhotoImage(Image.blend(icon, overlay, 0.3))
 
 class Tooltip(tp.Hovertip):
     """
@@ -1,24 +1,69 @@
 """
 IO package to read and write.
 """
-import logging
+import io
+import os
+import struct
+import threading
+
+from collections import OrderedDict
 
 from exif import Image as Exif
-from PIL import Image
 
 from exif_edit.converter import Converter, ExifFilter
+from exif_edit.jpeg import EOI, SOI, Jpeg, Segment
+from exif_edit.preview_cache import PreviewCache
+from exif_edit.tags import TAGS
+from exif_edit.tracing import traced
+
+
+#the Exif tag of the orientation
+ORIENTATION = 0x0112
+
+
+def pil():
+    """
+    Returns the Image module of Pillow. It is imported on the first call, because only
+    decoding an image needs it, reading and writing the tags don't.
+    """
+    from PIL import Image
+    return Image
 
 
 class Reader:
     """This class reads Exif Tags and the image itself."""
 
-    def __init__(self, img_path):
+    #the previews are cached across sessions
+    preview_cache = PreviewCache()
+
+    @traced
+    def __init__(self, img_path, header_only=False):
+        """
+        If header_only is True, only the APP1 segment with the Exif data is read from the file,
+        instead of the whole image. The reader falls back to reading the whole file, when there is
+        no such segment.
+        """
+        self.path = img_path
+        self.segment = None
         with open(img_path, 'rb') as file:
-            self.image = Exif(file)
+            if header_only:
+                self.segment = Jpeg.exif_segment(file)
+            if self.segment is None:
+                file.seek(0)
+                self.image = Exif(file)
+            else:
+                self.image = Exif(self.segment.stub())
+
+    def is_header_only(self) -> bool:
+        """
+        Returns True if only the Exif segment was read, then the binary object is not the whole image.
+        """
+        return self.segment is not None
 
     def binary(self):
         """
         This method returns the binary object, which is the image itself.
+        If the reader is header only, it contains just the Exif data.
         """
         return self.image
 
@@ -27,13 +72,62 @@ class Reader:
         """
         This method reads the binary image.
         If the parameter scale is True, then the image will be scaled using max_len.
+        The scaled image is taken from the preview cache, or else from the embedded thumbnail
+        if that is large enough, or else it is decoded at a reduced size.
+        The orientation is applied to the scaled image.
         """
-        img = Image.open(img_path)
-        if scale:
-            img.thumbnail((max_len, max_len))
+        if not scale:
+            return pil().open(img_path)
 
+        key = cls.preview_cache.key(img_path, max_len)
+        img = cls.preview_cache.get(key)
+        if img is None:
+            img = cls.__read_preview(img_path, max_len)
+            cls.preview_cache.put(key, img)
         return img
 
+    @classmethod
+    def __read_preview(cls, img_path, max_len):
+        img = pil().open(img_path)
+        orientation = img.getexif().get(ORIENTATION)
+        thumbnail = cls.__read_thumbnail(img, max_len)
+        if thumbnail is not None:
+            img = thumbnail
+        else:
+            #let the decoder reduce the image, before it is scaled exactly
+            img.draft("RGB", (max_len, max_len))
+        img.thumbnail((max_len, max_len))
+        return cls.__orientate(img, orientation)
+
+    @staticmethod
+    def __read_thumbnail(img, max_len):
+        """
+        Returns the thumbnail from the Exif data of the image, if it is large enough, else None.
+        """
+        exif = img.info.get("exif")
+        if exif is None:
+            return None
+        try:
+            #the parser of the exif library expects the whole APP1 segment
+            segment = Segment(0, b"\xff\xe1" + struct.pack(">H", len(exif) + 2) + exif)
+            thumbnail = pil().open(io.BytesIO(Exif(segment.stub()).get_thumbnail()))
+        except Exception:
+            return None
+        if max(thumbnail.size) < max_len:
+            return None
+        return thumbnail
+
+    @staticmethod
+    def __orientate(img, orientation):
+        image = pil()
+        #how to transpose the image for each value of the orientation
+        method = {2: image.FLIP_LEFT_RIGHT, 3: image.ROTATE_180, 4: image.FLIP_TOP_BOTTOM,
+            5: image.TRANSPOSE, 6: image.ROTATE_270, 7: image.TRANSVERSE,
+            8: image.ROTATE_90}.get(orientation)
+        if method is None:
+            return img
+        return img.transpose(method)
+
     def keys(self) -> list[str]:
         """
         This method returns a list of all keys, present in the Exif data.
@@ -58,6 +152,7 @@ class Reader:
 
         return dict(lst)
 
+    @traced
     def grouped_dict(self) -> dict:
         """
         Returns a dictionary with groups, where every group is sorted.
@@ -65,50 +160,152 @@ class Reader:
         return Converter.group_dict(self.dict())
 
 
+class ReaderCache:
+    """
+    This class keeps the readers of the images parsed in a session.
+    A reader is reused as long as the modification time and size of the file are unchanged.
+    The cache may be shared between threads.
+    """
+
+    def __init__(self, max_size = 8, header_only = False):
+        self.max_size = max_size
+        self.header_only = header_only
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, img_path) -> Reader:
+        """
+        Returns the cached reader for the path, or a new one if the file changed on disk.
+        """
+        key = os.path.abspath(img_path)
+        stamp = ReaderCache.__stamp(img_path)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.entries.move_to_end(key)
+                return entry[1]
+
+        #parse outside of the lock, so that other threads are not blocked meanwhile
+        reader = Reader(img_path, self.header_only)
+        with self.lock:
+            self.entries[key] = (stamp, reader)
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return reader
+
+    def invalidate(self, img_path):
+        """
+        Removes the reader for the path, e.g. after its binary has been modified by a writer.
+        """
+        with self.lock:
+            self.entries.pop(os.path.abspath(img_path), None)
+
+    @staticmethod
+    def __stamp(img_path):
+        stat = os.stat(img_path)
+        return stat.st_mtime_ns, stat.st_size
+
+
+class WriteError(ValueError):
+    """
+    Raised when tags could not be set, then the file is not written at all.
+    """
+
+    def __init__(self, errors):
+        #the message of the error by the key of the tag
+        self.errors = errors
+        super().__init__("can't set " + ", ".join(f"{key} ({msg})" for key, msg in errors.items()))
+
+
 class Writer:
     """This class writes the edited Exif Tags back to the image."""
 
-    def __init__(self, image, origin_dict = None):
+    def __init__(self, image, origin_dict = None, source_path = None, segment = None):
+        """
+        If the image comes from a header only reader, the source path and the segment of the
+        reader must be given. Then only the Exif segment is replaced in a copy of the source file.
+        """
         self.image = image
         self.origin_dict = {} if origin_dict is None else origin_dict
+        self.source_path = source_path
+        self.segment = segment
         self.converter = Converter()
 
-    def save(self, rows, img_path):
+    @traced
+    def save(self, rows, img_path) -> bool:
         """
         Saves the the collection of Exif tags to a file given by the path.
+        Only the tags which differ from the origin dictionary are written or deleted.
+        When nothing changed and the path is the source file, the file is not touched at all.
+        Returns True if the file was written. Raises a WriteError if a tag could not be set.
         """
-        self.__set_values(Converter.to_dict(rows))
+        changes, deletions, errors = self.__diff(Converter.to_dict(rows))
+        if errors:
+            raise WriteError(errors)
+        if not changes and not deletions and self.__is_source(img_path):
+            return False
+
+        errors = self.__set_values(changes)
+        if errors:
+            raise WriteError(errors)
+        self.__delete_tags(deletions)
         self.__save(img_path)
+        return True
 
-    def __set_values(self, dic):
+    def __diff(self, dic):
+        changes, errors = {}, {}
         for key, value in dic.items():
-            if Writer.__is_valid(key, value):
-                self.__set_value(key, value)
-                # updated an existing element, so remove from source
-                if key in self.origin_dict:
-                    self.origin_dict.pop(key)
+            if not Writer.__is_valid(key, value):
+                continue
+            try:
+                #the texts of the sheet are compared in the type of the origin
+                value = Converter.coerce(key, value, self.origin_dict.get(key))
+            except ValueError as exc:
+                errors[key] = str(exc)
+                continue
+            if Writer.__is_changed(self.origin_dict, key, value):
+                changes[key] = value
 
-        #the elements which survived above loop, are those which were deleted
-        self.__delete_tags()
+        #the elements of the origin, which are no longer present, were deleted
+        deletions = [key for key in self.origin_dict if dic.get(key) is None]
+        return changes, deletions, errors
 
-    def __set_value(self, key, value):
-        try:
-            val = self.converter.to_exif(key, value)
-            self.image[key] = val
-        except Exception as exc:
-            logging.warning("exception while setting new value: %s", exc)
+    @staticmethod
+    def __is_changed(origin, key, value):
+        return key not in origin or Converter.to_format(key, origin[key]) != value
+
+    def __is_source(self, img_path):
+        if self.source_path is None or not os.path.exists(img_path):
+            return False
+        return os.path.samefile(self.source_path, img_path)
+
+    @traced
+    def __set_values(self, dic):
+        errors = {}
+        for key, value in self.converter.to_exif_many(dic).items():
+            try:
+                self.image[key] = value
+            except Exception as exc:
+                #e.g. the exif library can't add a GPS IFD to every image
+                errors[key] = (str(exc).strip().splitlines() or [type(exc).__name__])[-1]
+        return errors
 
     @staticmethod
     def __is_valid(key, value):
-        return key not in ExifFilter.read_only() and value is not None
+        return not TAGS.is_read_only(key) and value is not None
 
-    def __delete_tags(self):
+    def __delete_tags(self, keys):
         #we need to iterate through each and check if we allowed to delete it
-        locked = ExifFilter.locked()
-        for key, _ in self.origin_dict.items():
-            if key not in locked:
+        for key in keys:
+            if not TAGS.is_locked(key):
                 self.image.delete(key)
 
+    @traced
     def __save(self, img_path):
-        with open(img_path, 'wb') as file:
-            file.write(self.image.get_file())
+        if self.segment is None:
+            with open(img_path, 'wb') as file:
+                file.write(self.image.get_file())
+        else:
+            #the binary is a stub, where the new segment is enclosed by SOI and EOI
+            data = self.image.get_file()[len(SOI):-len(EOI)]
+            Jpeg.splice(self.source_path, self.segment, data, img_path)
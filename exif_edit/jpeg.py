@@ -0,0 +1,148 @@
+"""
+Module to access the segments of a JPEG file without reading the image data.
+"""
+import os
+import shutil
+import struct
+import tempfile
+
+from typing import NamedTuple, Optional
+
+
+SOI = b"\xff\xd8"
+EOI = b"\xff\xd9"
+EXIF_HEADER = b"Exif\x00\x00"
+
+
+class Segment(NamedTuple):
+    """A segment of a JPEG file, including the marker and the length field."""
+    offset: int
+    data: bytes
+
+    def end(self) -> int:
+        """
+        Returns the position in the file right after the segment.
+        """
+        return self.offset + len(self.data)
+
+    def stub(self) -> bytes:
+        """
+        Returns a minimal JPEG, which contains only this segment.
+        """
+        return SOI + self.data + EOI
+
+
+class Jpeg:
+    """Walks through the markers of a JPEG file."""
+
+    APP1 = 0xE1
+    SOS = 0xDA
+    #markers without a length field
+    STANDALONE = frozenset([0x01, 0xD8, 0xD9] + list(range(0xD0, 0xD8)))
+
+    @classmethod
+    def exif_segment(cls, file) -> Optional[Segment]:
+        """
+        Reads the markers from the start of the file until the APP1 segment with the Exif data.
+        Only the headers of the segments in front of it are read, the reading stops at the latest
+        with the start of the scan data.
+        Returns None if the file is no JPEG or has no Exif data.
+        """
+        if file.read(2) != SOI:
+            return None
+
+        while True:
+            marker = cls.__read_marker(file)
+            if marker is None or marker == cls.SOS:
+                return None
+            offset = file.tell() - 2
+            if marker in cls.STANDALONE:
+                continue
+
+            field = file.read(2)
+            if len(field) < 2:
+                return None
+            length = struct.unpack(">H", field)[0]
+            if length < 2:
+                return None
+
+            if marker == cls.APP1:
+                payload = file.read(length - 2)
+                if payload.startswith(EXIF_HEADER):
+                    return Segment(offset, b"\xff" + bytes([marker]) + field + payload)
+            else:
+                file.seek(length - 2, 1)
+
+    @staticmethod
+    def __read_marker(file):
+        byte = file.read(1)
+        if byte != b"\xff":
+            return None
+        #a marker may be preceded by any number of fill bytes
+        while byte == b"\xff":
+            byte = file.read(1)
+        return byte[0] if byte else None
+
+    @classmethod
+    def splice(cls, source_path, segment, data, target_path):
+        """
+        Writes a copy of the source file to the target, where the segment is replaced by the data.
+        The parts before and after the segment are copied by the kernel where possible,
+        so they never pass through Python's memory. The copy is written to a temporary file,
+        which is renamed to the target at the end.
+        """
+        target_path = os.path.abspath(target_path)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix=".tmp")
+        try:
+            #the temporary file is opened first, so that it is closed if the source can't be opened
+            with open(fd, 'wb', buffering=0) as dst, open(source_path, 'rb', buffering=0) as src:
+                size = os.fstat(src.fileno()).st_size
+                cls.__copy(src, dst, 0, segment.offset)
+                cls.__write(dst, data)
+                cls.__copy(src, dst, segment.end(), size - segment.end())
+            mode_path = target_path if os.path.exists(target_path) else source_path
+            shutil.copymode(mode_path, tmp_path)
+            os.replace(tmp_path, target_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def __copy(cls, src, dst, offset, count):
+        """
+        Copies count bytes from the offset of the source to the current position of the destination.
+        Raises an OSError if the source ends before.
+        """
+        try:
+            while count > 0:
+                sent = cls.__copy_range(src.fileno(), dst.fileno(), offset, count)
+                if sent == 0:
+                    #some file systems copy nothing before the end, the rest tells
+                    break
+                offset += sent
+                count -= sent
+        except OSError:
+            #the kernel can not copy between these files
+            pass
+
+        #copy what is left in user space
+        src.seek(offset)
+        while count > 0:
+            chunk = src.read(min(count, 1024 * 1024))
+            if not chunk:
+                raise OSError(f"{src.name} ended {count} bytes early")
+            cls.__write(dst, chunk)
+            count -= len(chunk)
+
+    @staticmethod
+    def __write(dst, data):
+        #an unbuffered file may write less than it was given
+        view = memoryview(data)
+        while len(view) > 0:
+            view = view[dst.write(view):]
+
+    @staticmethod
+    def __copy_range(src_fd, dst_fd, offset, count):
+        if hasattr(os, "copy_file_range"):
+            return os.copy_file_range(src_fd, dst_fd, count, offset)
+        return os.sendfile(dst_fd, src_fd, offset, count)
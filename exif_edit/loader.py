@@ -0,0 +1,173 @@
+"""
+Module to load images in the background.
+"""
+import logging
+import os
+import queue
+import threading
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+
+class Loader:
+    """
+    This class reads the Exif tags and the preview of an image on a worker thread.
+    The results are put into a queue, which is polled from the thread of the GUI.
+    Results of a load, which was superseded by a newer one, are dropped.
+    """
+
+    EXIF = "exif"
+    PREVIEW = "preview"
+    ERROR = "error"
+
+    def __init__(self, mediator, executor = None, prefetcher = None):
+        self.mediator = mediator
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="loader")
+        self.executor = executor
+        self.prefetcher = prefetcher
+        self.results = queue.Queue()
+        self.generation = 0
+        self.future = None
+
+    def load(self, img_path):
+        """
+        Starts to load the image and cancels a previous load, which is not yet finished.
+        """
+        self.cancel()
+        self.future = self.executor.submit(self.__load, self.generation, img_path)
+
+    def cancel(self):
+        """
+        Cancels the current load, its pending results will be dropped.
+        """
+        self.generation += 1
+        if self.future is not None:
+            self.future.cancel()
+
+    def __load(self, generation, img_path):
+        fetched = self.prefetcher.get(img_path) if self.prefetcher is not None else None
+        if fetched is not None:
+            self.results.put((generation, Loader.EXIF, img_path, fetched[0]))
+            self.results.put((generation, Loader.PREVIEW, img_path, fetched[1]))
+            return
+
+        try:
+            dic = self.mediator.read_exif(img_path)
+            self.results.put((generation, Loader.EXIF, img_path, dic))
+            #no need to decode the preview, when the user already opened another image
+            if generation == self.generation:
+                img = self.mediator.read_image(img_path)
+                self.results.put((generation, Loader.PREVIEW, img_path, img))
+        except Exception as exc:
+            self.results.put((generation, Loader.ERROR, img_path, exc))
+
+    def poll(self) -> list:
+        """
+        Returns the results of the current load, which arrived since the last call.
+        Every result is a tuple of the kind, the path of the image and the value.
+        """
+        lst = []
+        while True:
+            try:
+                generation, kind, img_path, value = self.results.get_nowait()
+            except queue.Empty:
+                return lst
+            if generation == self.generation:
+                lst.append((kind, img_path, value))
+
+    def is_loading(self) -> bool:
+        """
+        Returns True if the current load has not finished or its results were not yet polled.
+        """
+        running = self.future is not None and not self.future.done()
+        return running or not self.results.empty()
+
+
+class Prefetcher:
+    """
+    This class reads the Exif tags and previews of the images, which are likely opened next,
+    in the background. The results are kept as long as they fit into the memory budget,
+    the least recently used ones are dropped first.
+    """
+
+    def __init__(self, mediator, budget = 64 * 1024 * 1024, executor = None):
+        self.mediator = mediator
+        self.budget = budget
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetcher")
+        self.executor = executor
+        self.entries = OrderedDict()
+        self.pending = {}
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def prefetch(self, paths):
+        """
+        Reads the images in the given order. Pending reads of images, which are not among
+        the paths anymore, are cancelled.
+        """
+        with self.lock:
+            for path, future in list(self.pending.items()):
+                if path not in paths and future.cancel():
+                    del self.pending[path]
+            for path in paths:
+                if path not in self.entries and path not in self.pending:
+                    self.pending[path] = self.executor.submit(self.__fetch, path)
+
+    def get(self, img_path) -> Optional[Tuple]:
+        """
+        Returns the Exif tags and the preview of the image, or None if they were not read yet
+        or the file changed since then.
+        """
+        with self.lock:
+            entry = self.entries.get(img_path)
+            if entry is None:
+                return None
+            if entry[0] != Prefetcher.__stamp(img_path):
+                self.__remove(img_path)
+                return None
+            self.entries.move_to_end(img_path)
+            return entry[1], entry[2]
+
+    def __fetch(self, img_path):
+        try:
+            stamp = Prefetcher.__stamp(img_path)
+            dic = self.mediator.read_exif(img_path)
+            img = self.mediator.read_image(img_path)
+        except Exception as exc:
+            logging.warning("can't prefetch image %s: %s", img_path, exc)
+            with self.lock:
+                self.pending.pop(img_path, None)
+            return
+
+        size = Prefetcher.__size(dic, img)
+        with self.lock:
+            self.pending.pop(img_path, None)
+            if size > self.budget:
+                return
+            self.__remove(img_path)
+            self.entries[img_path] = (stamp, dic, img, size)
+            self.used += size
+            while self.used > self.budget:
+                self.__remove(next(iter(self.entries)))
+
+    def __remove(self, img_path):
+        entry = self.entries.pop(img_path, None)
+        if entry is not None:
+            self.used -= entry[3]
+
+    @staticmethod
+    def __size(dic, img):
+        #the decoded pixels dominate, every tag is estimated generously
+        return img.width * img.height * len(img.getbands()) + len(dic) * 256
+
+    @staticmethod
+    def __stamp(img_path):
+        try:
+            stat = os.stat(img_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
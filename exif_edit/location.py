@@ -1,7 +1,7 @@
 """
 This module contains functionality related to geo location.
 """
-from typing import Tuple
+from typing import Optional, Tuple
 from exif_edit.formats import DegreeFormatFactory, DegreeFormat
 
 
@@ -21,6 +21,19 @@ class Coordinate:
         self.lat_ref = lat_ref
         self.lon_ref = lon_ref
 
+    @staticmethod
+    def find(lookup) -> Optional["Coordinate"]:
+        """
+        Returns the coordinate of the tags or None if latitude or longitude is missing.
+        The lookup is a function, which returns the value for a key or None if it is not present.
+        A missing reference is north or east.
+        """
+        lat, lon = lookup('gps_latitude'), lookup('gps_longitude')
+        if not lat or not lon:
+            return None
+        return Coordinate(lat, lon, lookup('gps_latitude_ref') or 'N',
+            lookup('gps_longitude_ref') or 'E')
+
     def decimal(self) -> Tuple:
         """
         This retuns the coordinate in decimal format.
@@ -37,3 +50,50 @@ class Coordinate:
         """
         lat, lon = self.decimal()
         return f"https://www.google.com/maps/place/{lat}+{lon}/@{lat},{lon},10z"
+
+
+class Location:
+    """
+    Keeps the coordinate found in the Exif tags. The coordinate is only looked up again,
+    after one of the tags it is made of has changed.
+    """
+
+    KEYS = frozenset(("gps_latitude", "gps_longitude", "gps_latitude_ref", "gps_longitude_ref"))
+
+    def __init__(self, lookup):
+        """
+        The lookup is a function, which returns the value for a key or None if it is not present.
+        """
+        self.lookup = lookup
+        self.valid = False
+        self.cached = None
+
+    @classmethod
+    def is_related(cls, key) -> bool:
+        """
+        Returns True if the key is one of the tags of the coordinate.
+        """
+        return key in cls.KEYS
+
+    def changed(self, *keys):
+        """
+        Notifies about changed tags, the coordinate is invalidated if any of them is related.
+        """
+        if any(Location.is_related(key) for key in keys):
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Forces a new lookup of the coordinate.
+        """
+        self.valid = False
+        self.cached = None
+
+    def coordinate(self) -> Optional[Coordinate]:
+        """
+        Returns the coordinate or None if latitude or longitude is missing.
+        """
+        if not self.valid:
+            self.cached = Coordinate.find(self.lookup)
+            self.valid = True
+        return self.cached
@@ -0,0 +1,107 @@
+"""
+Module to apply a manifest of tag edits to many images.
+"""
+import csv
+import json
+
+from typing import Iterator, Tuple
+
+from exif_edit.batch import Batch, Edits, Result, edit_item
+from exif_edit.tags import TAGS
+
+
+class Manifest:
+    """
+    This class collects the edits of a manifest per image, so that every image is read
+    and written only once, no matter how many of its tags are edited.
+    The manifest has the format of the export: CSV rows of path, key and value,
+    or JSON Lines with an object of path, key and value, or of path and tags.
+    In JSON Lines a value of null deletes the tag.
+    Like in the Writer, read only tags are not changed and locked tags are not deleted,
+    so that an export can be imported again. Those edits are skipped.
+    """
+
+    CSV = "csv"
+    JSONL = "jsonl"
+
+    def __init__(self):
+        #the assignments and deletions by path, in the order the paths appear
+        self.edits = {}
+        self.rows = 0
+        self.skipped = 0
+
+    def __len__(self):
+        return len(self.edits)
+
+    def add(self, path, key, value):
+        """
+        Adds the edit of a tag, a value of None deletes the tag.
+        """
+        if not path or not key:
+            raise ValueError(f"expected path and key, got: {path}, {key}")
+        self.rows += 1
+        if TAGS.is_read_only(key) or (value is None and TAGS.is_locked(key)):
+            self.skipped += 1
+            return
+
+        assign, deletions = self.edits.setdefault(path, ({}, []))
+        if value is None:
+            assign.pop(key, None)
+            deletions.append(key)
+        else:
+            assign[key] = value
+
+    @classmethod
+    def load(cls, file, fmt = CSV):
+        """
+        Reads the manifest from the open text file.
+        """
+        manifest = cls()
+        if fmt == Manifest.CSV:
+            reader = csv.DictReader(file)
+            if not {"path", "key", "value"}.issubset(reader.fieldnames or ()):
+                raise ValueError("expected the columns path, key and value")
+            for row in reader:
+                manifest.add(row["path"], row["key"], row["value"])
+        elif fmt == Manifest.JSONL:
+            for number, line in enumerate(file, 1):
+                if line.strip():
+                    manifest.__add_object(json.loads(line), number)
+        else:
+            raise ValueError(f"unknown format: {fmt}")
+        return manifest
+
+    def __add_object(self, obj, number):
+        if not isinstance(obj, dict) or "path" not in obj:
+            raise ValueError(f"expected an object with a path in line {number}")
+        if "tags" in obj:
+            for key, value in obj["tags"].items():
+                self.add(obj["path"], key, value)
+        else:
+            self.add(obj["path"], obj.get("key"), obj.get("value"))
+
+    def items(self) -> Iterator[Tuple[str, Edits]]:
+        """
+        Yields the path and the checked edits of every image.
+        Raises a ValueError if a value can not be converted.
+        """
+        for path, (assign, deletions) in self.edits.items():
+            yield path, Edits.checked(assign, deletions)
+
+    def apply(self, batch = None) -> Iterator[Result]:
+        """
+        Applies the edits on the pool of processes and yields the results as they complete.
+        The images, whose values can't be converted, fail without stopping the others.
+        """
+        batch = Batch() if batch is None else batch
+        failed = []
+        yield from batch.map(edit_item, self.__convertible(failed))
+        yield from failed
+
+    def __convertible(self, failed):
+        #the items, whose edits can be created, the others are collected as failed results
+        for path, (assign, deletions) in self.edits.items():
+            try:
+                yield path, Edits.checked(assign, deletions)
+            except ValueError as exc:
+                failed.append(Result(path, "failed", 0.0, str(exc)))
@@ -6,11 +6,97 @@ import os
 import logging
 import webbrowser
 
+from collections import Counter
 from typing import Optional
 
-from exif_edit.image_io import ExifFilter, Reader, Writer
+from exif_edit.image_io import Reader, ReaderCache, Writer
 from exif_edit.converter import Converter
-from exif_edit.location import Coordinate
+from exif_edit.folder import Folder
+from exif_edit.location import Coordinate, Location
+from exif_edit.tags import NOT_DELETABLE, READ_ONLY, TAGS
+from exif_edit.tracing import traced
+
+
+class KeyIndex:
+    """
+    This class keeps the keys of the rows in the table and how often each key occurs,
+    so that lookups and duplicate checks do not have to read the whole key column.
+    """
+
+    def __init__(self, keys = ()):
+        self.reset(keys)
+
+    def reset(self, keys):
+        """
+        Replaces the index with the keys of all rows.
+        """
+        self.keys = list(keys)
+        self.counts = Counter(self.keys)
+        self.rows = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def key(self, row):
+        """
+        Returns the key in the row or None if there is no such row.
+        """
+        return self.keys[row] if 0 <= row < len(self.keys) else None
+
+    def row(self, key) -> Optional[int]:
+        """
+        Returns the first row of the key or None if the key is not present.
+        """
+        if self.rows is None:
+            #rebuilt lazily, after rows were inserted or deleted
+            self.rows = {}
+            for row, k in enumerate(self.keys):
+                self.rows.setdefault(k, row)
+        return self.rows.get(key)
+
+    def count(self, key) -> int:
+        """
+        Returns how often the key is present.
+        """
+        return self.counts[key]
+
+    def insert(self, row, key = ""):
+        """
+        Inserts a key at the row, the following rows move down.
+        """
+        self.keys.insert(row, key)
+        self.counts[key] += 1
+        self.rows = None
+
+    def delete(self, row):
+        """
+        Deletes the key in the row, the following rows move up.
+        """
+        key = self.keys.pop(row)
+        self.__decrement(key)
+        self.rows = None
+
+    def update(self, row, key):
+        """
+        Changes the key in the row.
+        """
+        old = self.keys[row]
+        if old == key:
+            return
+        self.keys[row] = key
+        self.__decrement(old)
+        self.counts[key] += 1
+        if self.rows is not None:
+            if self.rows.get(old) == row:
+                #another row may still hold the old key
+                self.rows = None
+            elif key not in self.rows or self.rows[key] > row:
+                self.rows[key] = row
+
+    def __decrement(self, key):
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key]
 
 
 class Mediator:
@@ -20,51 +106,101 @@ class Mediator:
     def __init__(self, sheet):
         self.sheet = sheet
         self.origin_cell_value = None
+        self.cache = ReaderCache(header_only=True)
+        self.folder = None
+        self.index = KeyIndex()
+        self.location = Location(self.__lookup)
 
     def append_exif(self, img_path):
         """
         This method will read the Exif tags from the image and add them to the table.
         """
+        self.show_exif(img_path, self.read_exif(img_path))
+
+    def read_exif(self, img_path) -> dict:
+        """
+        This method reads the grouped Exif tags from the image.
+        It does not touch the table, so it can be called from a worker thread.
+        """
+        return self.cache.get(img_path).grouped_dict()
+
+    def show_exif(self, img_path, dic):
+        """
+        This method adds the Exif tags, which were read from the image, to the table.
+        """
         self.origin_img_path = img_path
         self.origin_cell_value = None
+        self.__set_sheet_data(dic)
 
-        reader = Reader(img_path)
-        self.__set_sheet_data(reader.grouped_dict())
+    def open_folder(self, directory, current = None) -> Optional[str]:
+        """
+        This method switches to the folder mode, where the user can move through the images
+        of the directory. It returns the path of the first image, or the current one if given.
+        """
+        self.folder = Folder(directory, current)
+        return self.folder.current()
+
+    def next_image(self) -> Optional[str]:
+        """
+        This method returns the path of the next image in the folder, or None if there is none.
+        """
+        return self.folder.next() if self.folder is not None else None
+
+    def previous_image(self) -> Optional[str]:
+        """
+        This method returns the path of the previous image in the folder, or None if there is none.
+        """
+        return self.folder.previous() if self.folder is not None else None
+
+    def upcoming_images(self, count) -> list:
+        """
+        This method returns the paths of the images, which will probably be opened next.
+        """
+        return self.folder.upcoming(count) if self.folder is not None else []
 
+    @traced
     def __set_sheet_data(self, dic):
-        #delete old rows if there are any
-        self.__delete_all_rows()
+        #reset the state of the old rows, the data itself is replaced at once
+        self.__enable_rows()
 
         lst = Converter.to_list(dic)
         self.__disable_rows(lst)
         self.sheet.set_sheet_data(lst, redraw=True)
+        self.index.reset(row[0] for row in lst)
+        self.location.invalidate()
 
-    def __delete_all_rows(self):
-        rows = self.sheet.get_total_rows()
-        while rows > 0:
-            self.sheet.delete_row(rows - 1)
-            rows = self.sheet.get_total_rows()
+    def __enable_rows(self):
+        rows = list(range(self.sheet.get_total_rows()))
+        if len(rows) > 0:
+            self.sheet.readonly_rows(rows, readonly=False)
+            self.sheet.readonly_cells(cells=[(row, 0) for row in rows], readonly=False)
+            self.sheet.dehighlight_all()
 
     def __disable_rows(self, lst):
-        keys = [i[0] for i in lst]
+        read_only, not_deletable = self.__count_matching_rows([i[0] for i in lst])
 
-        rows = self.__count_matching_rows(keys, ExifFilter.read_only())
-        if len(rows) > 0:
-            self.sheet.readonly_rows(rows)
-            self.sheet.highlight_rows(rows, bg = "light blue", fg = "black")
+        if len(read_only) > 0:
+            self.sheet.readonly_rows(read_only)
+            self.sheet.highlight_rows(read_only, bg = "light blue", fg = "black")
 
-        rows = self.__count_matching_rows(keys, ExifFilter.not_deleteable())
-        if len(rows) > 0:
-            for row in rows:
-                self.sheet.readonly_cells(row, 0)
-            self.sheet.highlight_rows(rows, bg = "light green", fg = "black")
+        if len(not_deletable) > 0:
+            self.sheet.readonly_cells(cells=[(row, 0) for row in not_deletable])
+            self.sheet.highlight_rows(not_deletable, bg = "light green", fg = "black")
 
     @classmethod
-    def __count_matching_rows(cls, keys, fltr) -> list:
-        lim = len(keys)
-        if lim > 0:
-            return [i for i in range(lim) if keys[i] in fltr]
-        return []
+    def __count_matching_rows(cls, keys) -> tuple:
+        """
+        Returns the rows of the read only keys and the rows of the keys which can not be deleted.
+        """
+        read_only_rows = []
+        not_deletable_rows = []
+        for i, key in enumerate(keys):
+            group = TAGS.group(key)
+            if group == READ_ONLY:
+                read_only_rows.append(i)
+            elif group == NOT_DELETABLE:
+                not_deletable_rows.append(i)
+        return read_only_rows, not_deletable_rows
 
     @classmethod
     def read_image(cls, img_path):
@@ -73,19 +209,20 @@ class Mediator:
         """
         return Reader.read_image(img_path, True)
 
-    @classmethod
-    def read_icon(cls, icon_name):
+    @staticmethod
+    def icon_path(icon_name) -> str:
         """
-        Read an icon from the assets.
+        Returns the path of an icon in the assets.
         """
-        icon_path = os.path.join(os.path.dirname(__file__), "assets/" + icon_name)
-        return Reader.read_image(icon_path)
+        return os.path.join(os.path.dirname(__file__), "assets", icon_name)
 
     def add_row(self):
         """
         This method adds a new row to the table.
         """
         self.sheet.insert_row(redraw=True)
+        index = self.index
+        index.insert(len(index))
 
     def insert_row(self):
         """
@@ -97,23 +234,33 @@ class Mediator:
             #append row after last selected one
             idx = list(selected)[-1]+1
             self.sheet.insert_row(idx=idx, redraw=True)
+            self.index.insert(idx)
 
     def remove_row(self):
         """
         This method removes selected row(s) from the table.
         """
-        index = 0
-        selected_rows = self.__get_selected_rows()
-        for selected in selected_rows:
-            col_data = self.sheet.get_column_data(0)
-            total_rows = len(col_data)
-            row = selected - index
-            if row < total_rows and self.__is_deletable(row):
+        index = self.index
+        deleted = 0
+        for selected in sorted(self.__get_selected_rows()):
+            row = selected - deleted
+            if row < len(index) and self.__is_deletable(row):
+                self.location.changed(index.key(row))
                 self.sheet.delete_row(row, True)
-                index+=1
+                index.delete(row)
+                deleted += 1
 
         self.sheet.refresh()
 
+    def reindex(self):
+        """
+        This method reads the keys from the table again,
+        it is called when the table was changed directly, e.g. by paste, undo or its context menu.
+        The coordinate is looked up again, because its rows might have changed too.
+        """
+        self.index.reset(self.sheet.get_column_data(0))
+        self.location.invalidate()
+
     def can_remove_row(self, event) -> bool:
         """
         This method returns True if the selected row is in an area where the user can
@@ -131,25 +278,35 @@ class Mediator:
         return selected_rows
 
     def __is_editable_row_selected(self):
-        selected_rows = self.__get_selected_rows()
-        return [self.__is_deletable(row) for row in selected_rows].count(True) > 0
+        return any(self.__is_deletable(row) for row in self.__get_selected_rows())
 
     def __is_deletable(self, row):
-        key = self.sheet.get_cell_data(row, 0)
-        return not key in ExifFilter.locked()
+        key = self.index.key(row)
+        return not TAGS.is_locked(key)
 
     def save_exif(self, new_img_path="", origin_img_path=""):
         """
         This method saves the Exif Tags back to the image.
         """
         orig_path = self.__path(self.origin_img_path, origin_img_path)
-        reader = Reader(orig_path)
-        writer = Writer(reader.binary(), reader.dict())
+        #the image parsed when it was loaded is reused, unless the file changed meanwhile
+        reader = self.cache.get(orig_path)
+        writer = Writer(reader.binary(), reader.dict(), reader.path, reader.segment)
 
         target_path = self.__path(orig_path, new_img_path)
         logging.info("saving file: %s", target_path)
         data = self.sheet.get_sheet_data()
-        writer.save(data, target_path)
+        try:
+            saved = writer.save(data, target_path)
+        except Exception:
+            self.cache.invalidate(orig_path)
+            raise
+
+        if saved:
+            #the writer modified the parsed image
+            self.cache.invalidate(orig_path)
+        else:
+            logging.info("nothing changed in file: %s", target_path)
 
     @classmethod
     def __path(cls, source, path):
@@ -168,8 +325,10 @@ class Mediator:
         """
         if self.__is_in_key_column(cell):
             self.__restore_key_when_duplicate(cell)
+            self.location.changed(self.origin_cell_value, self.index.key(cell[0]))
         else:
             self.__parse_value(cell)
+            self.location.changed(self.index.key(cell[0]))
 
     @classmethod
     def __is_in_key_column(cls, cell):
@@ -204,13 +363,16 @@ class Mediator:
     def __restore_origin_cell_data(self, row, column):
         origin = self.origin_cell_value
         self.sheet.set_cell_data(row, column, origin)
+        if column == 0:
+            self.index.update(row, origin)
 
     def __has_duplicate_keys(self, row):
         key = self.sheet.get_cell_data(row, 0)
+        index = self.index
+        index.update(row, key)
         if "".__eq__(key):
             return False
-        keys = self.sheet.get_column_data(0)
-        return keys.count(key) > 1
+        return index.count(key) > 1
 
     def sort(self):
         """
@@ -246,14 +408,13 @@ class Mediator:
         """
         This method looks for a possible coordinate in the Exif data.
         If there is one it will return it, if there is none it will return None.
+        The coordinate is kept until one of its rows changes.
         """
-        dic = self.__data_as_dict()
-        loc = (dic.get('gps_latitude'), dic.get('gps_longitude'))
-        if all(loc):
-            la_ref = dic.get('gps_latitude_ref')
-            lo_ref = dic.get('gps_longitude_ref')
-            return Coordinate(loc[0], loc[1], lat_ref=la_ref, lon_ref=lo_ref)
-        return None
+        return self.location.coordinate()
+
+    def __lookup(self, key):
+        row = self.index.row(key)
+        return self.__get_value(row) if row is not None else None
 
     def has_rows(self) -> bool:
         """
@@ -0,0 +1,150 @@
+"""
+Module for a persistent cache of the scaled previews.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+
+class PreviewCache:
+    """
+    This class stores the scaled previews of images as small files in a directory.
+    A preview is found by the path, modification time and size of the image and the maximal length.
+    When the files exceed the size of the cache, the least recently used previews are removed.
+    The loader and the prefetcher share the cache, so its size is kept under a lock.
+    """
+
+    #the variable with the size of the cache in MiB, 0 disables it
+    SIZE_VARIABLE = "EXIF_EDIT_PREVIEW_CACHE_MB"
+    DEFAULT_MB = 64
+
+    def __init__(self, directory = None, max_bytes = None):
+        self.directory = PreviewCache.default_directory() if directory is None else directory
+        self.max_bytes = PreviewCache.default_max_bytes() if max_bytes is None else max_bytes
+        self.total = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def default_directory() -> str:
+        """
+        Returns the directory of the cache in the user's cache folder.
+        """
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        return os.path.join(base, "exif_edit", "previews")
+
+    @staticmethod
+    def default_max_bytes() -> int:
+        """
+        Returns the size of the cache from the environment variable, or else 64 MiB.
+        """
+        value = os.environ.get(PreviewCache.SIZE_VARIABLE)
+        if not value:
+            return PreviewCache.DEFAULT_MB * 1024 * 1024
+        try:
+            return max(0, int(float(value) * 1024 * 1024))
+        except ValueError:
+            logging.warning("%s is no number: %s", PreviewCache.SIZE_VARIABLE, value)
+            return PreviewCache.DEFAULT_MB * 1024 * 1024
+
+    def enabled(self) -> bool:
+        """
+        Returns True if the cache may store anything.
+        """
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(img_path, max_len) -> str:
+        """
+        Returns the key of the preview for the image in its current state on disk.
+        """
+        stat = os.stat(img_path)
+        ident = f"{os.path.abspath(img_path)}|{stat.st_mtime_ns}|{stat.st_size}|{max_len}"
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """
+        Returns the preview for the key or None if there is none.
+        """
+        if not self.enabled():
+            return None
+        from PIL import Image
+        path = self.__path(key)
+        try:
+            img = Image.open(path)
+            img.load()
+            #mark the preview as recently used
+            os.utime(path)
+            return img
+        except OSError:
+            return None
+
+    def put(self, key, img):
+        """
+        Stores the preview for the key and removes old previews if the cache is full.
+        """
+        if not self.enabled():
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as file:
+                #a preview is shown as is, so e.g. CMYK or a palette can be stored as RGB
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                img.save(file, "JPEG", quality=90)
+            path = self.__path(key)
+            with self.lock:
+                os.replace(tmp_path, path)
+                tmp_path = None
+                self.__grow(os.path.getsize(path))
+        except (OSError, ValueError) as exc:
+            logging.warning("can't store preview: %s", exc)
+        finally:
+            #a partly written file is never found by its key, so it would stay forever
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def clear(self):
+        """
+        Removes all previews.
+        """
+        with self.lock:
+            for entry in self.__entries():
+                os.unlink(entry.path)
+            self.total = 0
+
+    def __path(self, key):
+        return os.path.join(self.directory, key)
+
+    def __entries(self):
+        try:
+            with os.scandir(self.directory) as entries:
+                return [e for e in entries if e.is_file() and not e.name.endswith(".tmp")]
+        except FileNotFoundError:
+            return []
+
+    def __grow(self, size):
+        if self.total is None:
+            self.total = sum(e.stat().st_size for e in self.__entries())
+        else:
+            self.total += size
+        if self.total > self.max_bytes:
+            self.__evict()
+
+    def __evict(self):
+        #remove the least recently used previews, until the cache is filled to 3/4
+        entries = sorted(self.__entries(), key=lambda e: e.stat().st_mtime_ns)
+        self.total = sum(e.stat().st_size for e in entries)
+        limit = self.max_bytes * 3 // 4
+        for entry in entries:
+            if self.total <= limit:
+                break
+            try:
+                size = entry.stat().st_size
+                os.unlink(entry.path)
+                self.total -= size
+            except FileNotFoundError:
+                pass
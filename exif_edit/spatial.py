@@ -0,0 +1,167 @@
+"""
+Module for a spatial index over the coordinates of a whole library.
+"""
+import math
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from exif_edit.batch import Batch
+from exif_edit.image_io import Reader
+from exif_edit.location import Coordinate
+
+
+#mean radius of the earth in km
+EARTH_RADIUS = 6371.0
+
+
+def read_coordinate(path) -> Tuple[str, Optional[Tuple[float, float]]]:
+    """
+    Returns the path and the decimal coordinate of the image, or None if it has no location.
+    This is a module level function, so that it can be sent to a worker process.
+    """
+    try:
+        reader = Reader(path, header_only=True)
+        if not reader.binary().has_exif:
+            return path, None
+        keys = set(reader.keys())
+        coord = Coordinate.find(lambda key: reader.value(key) if key in keys else None)
+    except Exception:
+        #the file can't be read or its Exif data is broken, the exif library raises many types
+        return path, None
+    return path, None if coord is None else coord.decimal()
+
+
+class SpatialIndex:
+    """
+    This class keeps the coordinates of many images in a grid of cells.
+    The entries are sorted by their cell, so that the entries of a row of cells
+    are found by binary search. Only the entries of the cells, which overlap a query,
+    are checked exactly.
+    """
+
+    def __init__(self, paths, latitudes, longitudes, cell = 0.1):
+        """
+        The cell is the size of a grid cell in degrees.
+        """
+        self.cell = cell
+        self.columns = int(math.ceil(360 / cell)) + 1
+        lat = np.asarray(latitudes, dtype=float)
+        lon = np.asarray(longitudes, dtype=float)
+        keys = self.__row(lat) * self.columns + self.__column(lon)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.latitudes = lat[order]
+        self.longitudes = lon[order]
+        self.paths = [paths[i] for i in order.tolist()]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __row(self, lat):
+        return np.floor((np.asarray(lat) + 90) / self.cell).astype(np.int64)
+
+    def __column(self, lon):
+        return np.floor((np.asarray(lon) + 180) / self.cell).astype(np.int64)
+
+    @classmethod
+    def build(cls, paths: Iterable, batch = None, cell = 0.1):
+        """
+        Reads the coordinates of all images found in the files, directories or globs.
+        Images without a location are left out.
+        """
+        batch = Batch() if batch is None else batch
+        found, lats, lons = [], [], []
+        for path, coord in batch.map(read_coordinate, Batch.files(paths)):
+            if coord is not None:
+                found.append(path)
+                lats.append(coord[0])
+                lons.append(coord[1])
+        return cls(found, lats, lons, cell)
+
+    def save(self, path):
+        """
+        Stores the index in a NumPy file.
+        """
+        #paths can not contain a NUL, so they are stored as one joined buffer
+        names = "\0".join(self.paths).encode("utf-8", "surrogateescape")
+        with open(path, "wb") as file:
+            np.savez_compressed(file, latitudes=self.latitudes, longitudes=self.longitudes,
+                paths=np.frombuffer(names, dtype=np.uint8), cell=np.array(self.cell))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an index, which was stored with save().
+        """
+        with np.load(path, allow_pickle=False) as data:
+            names = data["paths"].tobytes().decode("utf-8", "surrogateescape")
+            paths = names.split("\0") if names else []
+            return cls(paths, data["latitudes"], data["longitudes"], float(data["cell"]))
+
+    def bbox(self, south, west, north, east) -> List[Tuple[str, float, float]]:
+        """
+        Returns the path, latitude and longitude of the images inside the box.
+        A box with west greater than east crosses the 180th meridian.
+        """
+        if west > east:
+            return self.bbox(south, west, north, 180.0) + self.bbox(south, -180.0, north, east)
+
+        idx = self.__candidates(south, west, north, east)
+        lat = self.latitudes[idx]
+        lon = self.longitudes[idx]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return [(self.paths[i], la, lo) for i, la, lo
+            in zip(idx[inside].tolist(), lat[inside].tolist(), lon[inside].tolist())]
+
+    def within(self, latitude, longitude, km) -> List[Tuple[str, float, float, float]]:
+        """
+        Returns the path, latitude, longitude and the distance in km of the images within
+        the radius around the point, the nearest first.
+        """
+        boxes = SpatialIndex.__boxes(latitude, longitude, km)
+        idx = np.concatenate([self.__candidates(*box) for box in boxes])
+        dist = SpatialIndex.distance(latitude, longitude, self.latitudes[idx], self.longitudes[idx])
+        inside = dist <= km
+        idx, dist = idx[inside], dist[inside]
+        idx = idx[np.argsort(dist, kind="stable")]
+        dist = np.sort(dist, kind="stable")
+        return [(self.paths[i], la, lo, d) for i, la, lo, d in zip(idx.tolist(),
+            self.latitudes[idx].tolist(), self.longitudes[idx].tolist(), dist.tolist())]
+
+    @staticmethod
+    def distance(latitude, longitude, latitudes, longitudes) -> np.ndarray:
+        """
+        Returns the great circle distances in km between the point and the coordinates.
+        """
+        lat1, lon1 = math.radians(latitude), math.radians(longitude)
+        lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+        hav = np.sin((lat2 - lat1) / 2) ** 2 \
+            + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(hav, 0.0, 1.0)))
+
+    @staticmethod
+    def __boxes(latitude, longitude, km):
+        #the bounding boxes of a circle, split at the 180th meridian
+        radius = km / EARTH_RADIUS
+        south = max(-90.0, latitude - math.degrees(radius))
+        north = min(90.0, latitude + math.degrees(radius))
+        ratio = math.sin(radius) / max(math.cos(math.radians(latitude)), 1e-12)
+        if south == -90.0 or north == 90.0 or radius >= math.pi / 2 or ratio >= 1:
+            return [(south, -180.0, north, 180.0)]
+
+        delta = math.degrees(math.asin(ratio))
+        west, east = longitude - delta, longitude + delta
+        if west < -180:
+            return [(south, west + 360, north, 180.0), (south, -180.0, north, east)]
+        if east > 180:
+            return [(south, west, north, 180.0), (south, -180.0, north, east - 360)]
+        return [(south, west, north, east)]
+
+    def __candidates(self, south, west, north, east) -> np.ndarray:
+        rows = np.arange(self.__row(south), self.__row(north) + 1)
+        first = np.searchsorted(self.keys, rows * self.columns + self.__column(west), side="left")
+        last = np.searchsorted(self.keys, rows * self.columns + self.__column(east), side="right")
+        ranges = [np.arange(lo, hi) for lo, hi in zip(first.tolist(), last.tolist()) if hi > lo]
+        return np.concatenate(ranges) if ranges else np.zeros(0, dtype=np.int64)
@@ -0,0 +1,118 @@
+"""
+Module with the metadata of the Exif tags, which need a special treatment.
+"""
+from typing import Callable, Dict, Optional
+
+import exif as ex
+
+#the types of the tags, which the exif library can add to an image, the module is private
+#to the pinned exif 1.2.1, without it the values are converted by the types of the origin
+try:
+    from exif._constants import ATTRIBUTE_TYPE_MAP
+except ImportError:
+    ATTRIBUTE_TYPE_MAP = {}
+
+from exif_edit.formats import DegreeFormatFactory, TimeStamp
+
+
+#the tags with the capture time, the first one present is used
+TIME_KEYS = ("datetime_original", "datetime_digitized", "datetime")
+#the format of the capture time
+TIME_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+#the Python type of the values by the Exif type: byte, short, long, slong, rational, srational
+VALUE_TYPES = {1: int, 3: int, 4: int, 9: int, 5: float, 10: float}
+
+#the groups in the order they are shown
+READ_ONLY = 0
+NOT_DELETABLE = 1
+EDITABLE = 2
+
+
+class Registry:
+    """
+    This class holds the metadata of the tags. Everything is computed once,
+    so that every classification is a single lookup.
+    """
+
+    def __init__(self, read_only, not_deletable, enums: Dict[str, type],
+        formatters: Dict[str, Callable], value_types: Dict[str, type] = None):
+        self.read_only = frozenset(read_only)
+        self.not_deletable = frozenset(not_deletable)
+        self.locked = self.read_only | self.not_deletable
+        self.enums = dict(enums)
+        self.formatters = dict(formatters)
+        self.value_types = {} if value_types is None else dict(value_types)
+
+        self.groups = {key: self.__group(key) for key in self.locked}
+
+    def __group(self, key):
+        if key in self.read_only:
+            return READ_ONLY
+        if key in self.not_deletable:
+            return NOT_DELETABLE
+        return EDITABLE
+
+    def group(self, key) -> int:
+        """
+        Returns the group of the tag.
+        """
+        return self.groups.get(key, EDITABLE)
+
+    def is_read_only(self, key) -> bool:
+        """
+        Returns True if the tag can not be changed.
+        """
+        return key in self.read_only
+
+    def is_locked(self, key) -> bool:
+        """
+        Returns True if the tag can not be deleted.
+        """
+        return key in self.locked
+
+    def enum(self, key) -> Optional[type]:
+        """
+        Returns the enum of the tag's values or None.
+        """
+        return self.enums.get(key)
+
+    def formatter(self, key) -> Optional[Callable]:
+        """
+        Returns the function, which creates a custom format for the tag's values, or None.
+        """
+        return self.formatters.get(key)
+
+    def value_type(self, key) -> Optional[type]:
+        """
+        Returns int or float, if the tag has numeric values, else None.
+        """
+        return self.value_types.get(key)
+
+
+TAGS = Registry(
+    read_only=("_exif_ifd_pointer", "_gps_ifd_pointer", "exif_version"),
+    not_deletable=("bits_per_sample", "compression",
+        "image_height", "image_width", "image_unique_id",
+        "jpeg_interchange_format", "jpeg_interchange_format_length",
+        "photometric_interpretation",
+        "resolution_unit",
+        "samples_per_pixel", "x_resolution", "y_resolution"),
+    enums={"color_space": ex.ColorSpace,
+        "exposure_mode": ex.ExposureMode,
+        "exposure_program": ex.ExposureProgram,
+        "gps_altitude_ref": ex.GpsAltitudeRef,
+        "light_source": ex.LightSource,
+        "metering_mode": ex.MeteringMode,
+        "orientation": ex.Orientation,
+        "resolution_unit": ex.ResolutionUnit,
+        "saturation": ex.Saturation,
+        "scene_capture_type": ex.SceneCaptureType,
+        "sensing_method": ex.SensingMethod,
+        "sharpness": ex.Sharpness,
+        "white_balance": ex.WhiteBalance},
+    formatters={"gps_latitude": DegreeFormatFactory.create,
+        "gps_longitude": DegreeFormatFactory.create,
+        "gps_timestamp": TimeStamp.parse},
+    value_types={key: VALUE_TYPES[kind] for key, (kind, _) in ATTRIBUTE_TYPE_MAP.items()
+        if kind in VALUE_TYPES})
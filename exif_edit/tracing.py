@@ -0,0 +1,119 @@
+"""
+Module to trace the time spent in the hot paths, written in the Chrome trace format.
+"""
+import functools
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+
+from typing import Callable, List, Tuple
+
+
+#the functions, which are traced when a tracer is installed
+SPANS: List[Tuple[Callable, str]] = []
+
+#the modules with traced functions, the commands import them lazily, so they might not be
+#imported yet, when the tracer is installed
+MODULES = ("exif_edit.image_io", "exif_edit.mediator")
+
+
+def traced(func):
+    """
+    Marks the function or method as a span. The function itself is returned, so a span costs
+    nothing until a tracer is installed. Put it below staticmethod or classmethod.
+    """
+    SPANS.append((func, func.__qualname__))
+    return func
+
+
+class Tracer:
+    """
+    This class records the spans of the traced functions as complete events, which can be
+    opened in chrome://tracing or Perfetto. Installing the tracer replaces the traced functions
+    of their classes with wrappers, uninstalling restores them.
+    The spans of all threads are recorded, those of worker processes are not.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.events = []
+        self.threads = {}
+        self.originals = []
+
+    def record(self, name, begin, end):
+        """
+        Adds a span with the begin and end in nanoseconds of the performance counter.
+        """
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        self.events.append({"name": name, "ph": "X", "pid": self.pid, "tid": tid,
+            "ts": (begin - self.origin) / 1000, "dur": (end - begin) / 1000})
+
+    def wrap(self, func, name) -> Callable:
+        """
+        Returns a function, which records a span around every call of the function.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            begin = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, begin, time.perf_counter_ns())
+        return wrapper
+
+    def install(self):
+        """
+        Replaces every traced function with a wrapper, which records its spans.
+        The modules with traced functions are imported first, so that their spans are known.
+        """
+        for module in MODULES:
+            importlib.import_module(module)
+        for func, name in SPANS:
+            owner, attr = Tracer.__owner(func)
+            original = owner.__dict__[attr]
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapper = type(original)(self.wrap(original.__func__, name))
+            else:
+                wrapper = self.wrap(original, name)
+            setattr(owner, attr, wrapper)
+            self.originals.append((owner, attr, original))
+
+    def uninstall(self):
+        """
+        Restores the traced functions.
+        """
+        for owner, attr, original in reversed(self.originals):
+            setattr(owner, attr, original)
+        self.originals.clear()
+
+    @staticmethod
+    def __owner(func):
+        #the module or class, which holds the function, and the name of its attribute
+        owner = sys.modules[func.__module__]
+        *path, name = func.__qualname__.split(".")
+        for part in path:
+            owner = getattr(owner, part)
+        if name.startswith("__") and not name.endswith("__"):
+            name = f"_{owner.__name__.lstrip('_')}{name}"
+        return owner, name
+
+    def trace(self) -> dict:
+        """
+        Returns the recorded spans with the names of the threads in the Chrome trace format.
+        """
+        names = [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid,
+            "args": {"name": name}} for tid, name in self.threads.items()]
+        return {"traceEvents": names + self.events, "displayTimeUnit": "ms"}
+
+    def save(self, path):
+        """
+        Writes the trace as JSON to the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.trace(), file)
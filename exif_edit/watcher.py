@@ -0,0 +1,115 @@
+"""
+Module to keep the catalog current, while images are added to or changed in directories.
+"""
+import os
+import threading
+import time
+
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from exif_edit.batch import Batch
+
+
+class Change(NamedTuple):
+    """The images, which changed since the last poll."""
+    changed: List[str]
+    removed: List[str]
+    added: int
+    updated: int
+    failed: int
+    elapsed: float
+
+    def is_empty(self) -> bool:
+        """
+        Returns True if nothing changed.
+        """
+        return not self.changed and not self.removed
+
+
+class Watcher:
+    """
+    This class polls directories for new, changed and removed images, without any
+    notification service of the system. Every poll takes a snapshot of the modification
+    times and sizes, only the differences to the last snapshot are read on the pool of
+    processes and written to the catalog.
+    """
+
+    def __init__(self, catalog, directories: Iterable, interval = 2.0, batch = None):
+        self.catalog = catalog
+        self.directories = [os.path.abspath(d) for d in directories]
+        self.interval = interval
+        self.batch = Batch() if batch is None else batch
+        self.snapshot = None
+
+    @staticmethod
+    def scan(directories) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the modification time and size of every image in the directories by its path.
+        """
+        snapshot = {}
+        pending = list(directories)
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file() and Batch.is_image(entry.name):
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                #the directory was removed or can't be read
+                continue
+        return snapshot
+
+    @staticmethod
+    def diff(old, new) -> Tuple[List[str], List[str]]:
+        """
+        Returns the sorted paths, which are new or changed, and the paths, which were removed.
+        """
+        changed = sorted(path for path, stamp in new.items() if old.get(path) != stamp)
+        removed = sorted(path for path in old if path not in new)
+        return changed, removed
+
+    def __is_watched(self, path):
+        return any(path.startswith(d + os.sep) for d in self.directories)
+
+    def poll(self) -> Change:
+        """
+        Takes a new snapshot and updates the catalog with the differences.
+        The first poll compares with the images, which are already in the catalog.
+        Images, which failed, are read again by the next poll.
+        """
+        begin = time.perf_counter()
+        if self.snapshot is None:
+            self.snapshot = {path: stamp for path, stamp in self.catalog.stamps().items()
+                if self.__is_watched(path)}
+
+        snapshot = Watcher.scan(self.directories)
+        changed, removed = Watcher.diff(self.snapshot, snapshot)
+        added = updated = failed = 0
+        if changed:
+            added, updated, failed = self.catalog.update(changed, self.batch)
+        if failed:
+            #the images, which could not be read, are left out, so that the next poll retries them
+            stored = self.catalog.stamps()
+            for path in changed:
+                if stored.get(path) != snapshot[path]:
+                    del snapshot[path]
+        if removed:
+            self.catalog.remove(removed)
+        self.snapshot = snapshot
+        return Change(changed, removed, added, updated, failed, time.perf_counter() - begin)
+
+    def run(self, callback: Optional[Callable] = None, stop: Optional[threading.Event] = None):
+        """
+        Polls until the stop event is set. The callback gets every change, which is not empty.
+        Between two polls the thread sleeps, so it is idle when nothing changes.
+        """
+        stop = threading.Event() if stop is None else stop
+        while not stop.is_set():
+            change = self.poll()
+            if callback is not None and not change.is_empty():
+                callback(change)
+            stop.wait(self.interval)
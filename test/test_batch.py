@@ -0,0 +1,107 @@
+import unittest
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from unittest.mock import patch
+
+from exif_edit.batch import Batch, Edits, edit_file
+from exif_edit.image_io import Reader
+
+class TestBatch(unittest.TestCase):
+
+    def __path(self, name):
+        img = 'test/resources/' + name
+        return os.path.realpath(img)
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(self.__path('lookup.jpg'), self.img)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_parse_edits(self):
+        edits = Edits.parse(["model=foo", "make = bar "], [" software"])
+        self.assertDictEqual({'model': 'foo', 'make': 'bar'}, edits.assign)
+        self.assertEqual(("software",), edits.delete)
+
+    def test_parse_edits_raises_error(self):
+        self.assertRaises(ValueError, lambda: Edits.parse(["model"], []))
+        self.assertRaises(ValueError, lambda: Edits.parse(["exif_version=1"], []))
+        self.assertRaises(ValueError, lambda: Edits.parse([], ["image_width"]))
+        self.assertRaises(ValueError, lambda: Edits.parse([], [" "]))
+
+    def test_apply_edits(self):
+        edits = Edits({'model': 'foo'}, ["software"])
+        res = edits.apply({'model': 'bar', 'software': 'python'})
+        self.assertDictEqual({'model': 'foo'}, res)
+
+    def test_files(self):
+        os.mkdir(os.path.join(self.dir, 'sub'))
+        nested = os.path.join(self.dir, 'sub', 'b.JPG')
+        shutil.copy(self.img, nested)
+        open(os.path.join(self.dir, 'c.txt'), 'w').close()
+
+        self.assertListEqual([self.img, nested], list(Batch.files([self.dir])))
+        self.assertListEqual([self.img], list(Batch.files([os.path.join(self.dir, '*.jpg')])))
+
+    def test_files_home(self):
+        with patch.dict(os.environ, {'HOME': self.dir, 'USERPROFILE': self.dir}):
+            self.assertListEqual([self.img], list(Batch.files([os.path.join('~', 'a.jpg')])))
+            self.assertListEqual([self.img], list(Batch.files([os.path.join('~', '*.jpg')])))
+            self.assertListEqual([], Batch.unmatched([os.path.join('~', '*.jpg')]))
+
+    def test_unmatched(self):
+        missing = os.path.join(self.dir, 'missing.jpg')
+        pattern = os.path.join(self.dir, '*.png')
+        self.assertListEqual([missing, pattern],
+            Batch.unmatched([self.dir, self.img, missing, pattern, os.path.join(self.dir, '*.jpg')]))
+
+    def test_command_unmatched(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        missing = os.path.join(self.dir, 'missing')
+        res = subprocess.run([sys.executable, "__main__.py", "batch", missing, "--set", "model=foo"],
+            cwd=root, capture_output=True, text=True)
+        self.assertEqual(2, res.returncode)
+        self.assertTrue(missing in res.stderr)
+
+    def test_edit_file(self):
+        res = edit_file(self.img, Edits({'model': 'foo'}, ["software"]))
+        self.assertFalse(res.failed())
+
+        dic = Reader(self.img).dict()
+        self.assertEqual('foo', dic['model'])
+        self.assertFalse('software' in dic)
+
+    def test_edit_file_coerces_values(self):
+        res = edit_file(self.img, Edits.parse(["image_width=300", "orientation=1"], []))
+        self.assertEqual('saved', res.status)
+        dic = Reader(self.img).dict()
+        self.assertEqual(300, dic['image_width'])
+        self.assertEqual('TOP_LEFT', dic['orientation'])
+
+    def test_edit_file_wrong_type(self):
+        res = edit_file(self.img, Edits.parse(["image_width=wide"], []))
+        self.assertEqual('failed', res.status)
+        self.assertEqual(256, Reader(self.img).dict()['image_width'])
+
+    def test_edit_file_unchanged(self):
+        edits = Edits({'model': 'foo'})
+        self.assertEqual('saved', edit_file(self.img, edits).status)
+        self.assertEqual('unchanged', edit_file(self.img, edits).status)
+
+    def test_edit_file_failed(self):
+        res = edit_file(os.path.join(self.dir, 'missing.jpg'), Edits())
+        self.assertTrue(res.failed())
+
+    def test_edit(self):
+        results = list(Batch(2).edit([self.dir], Edits({'model': 'foo'})))
+        self.assertEqual(1, len(results))
+        self.assertEqual('foo', Reader(self.img).dict()['model'])
+
+if __name__ == '__main__':
+    unittest.main()
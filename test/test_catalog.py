@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from unittest.mock import patch
+
+from exif_edit.batch import Batch, Edits, edit_file
+from exif_edit.catalog import Catalog, read_entry
+
+class TestCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        self.other = os.path.join(self.dir, 'b.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        shutil.copy(self.img, self.other)
+        #the exif library can't add the GPS tags after a new tag in the Exif IFD
+        edit_file(self.other, Edits({"gps_latitude": (48, 8, 13.2), "gps_latitude_ref": "N",
+            "gps_longitude": (11, 34, 30), "gps_longitude_ref": "E"}))
+        edit_file(self.other, Edits({"model": "Foo", "datetime_original": "2025:05:01 10:00:00"}))
+        self.catalog = Catalog(os.path.join(self.dir, 'catalog.db'))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.dir)
+
+    def test_read_entry(self):
+        _, entry, error = read_entry(self.other)
+        self.assertIsNone(error)
+        self.assertEqual("2025-05-01 10:00:00", entry.taken)
+        self.assertEqual("Foo", entry.model)
+        self.assertAlmostEqual(48.137, entry.latitude)
+
+    def test_read_entry_failed(self):
+        _, entry, error = read_entry(os.path.join(self.dir, 'c.jpg'))
+        self.assertIsNone(entry)
+        self.assertIsNotNone(error)
+
+    def test_scan(self):
+        res = self.catalog.scan([self.dir], Batch(1))
+        self.assertEqual((2, 0, 0, 0, 0), res[:5])
+        self.assertEqual(2, len(self.catalog))
+
+    def test_rescan_is_incremental(self):
+        self.catalog.scan([self.dir], Batch(1))
+        self.assertEqual((0, 0, 2, 0, 0), self.catalog.scan([self.dir], Batch(1))[:5])
+
+        edit_file(self.img, Edits({"model": "Bar"}))
+        os.unlink(self.other)
+        self.assertEqual((0, 1, 0, 1, 0), self.catalog.scan([self.dir], Batch(1))[:5])
+        self.assertEqual("Bar", self.catalog.tags(self.img)["model"])
+
+    def test_update_commits_chunks(self):
+        class Interrupted(Batch):
+            def map(self, func, items, *args):
+                for item in items:
+                    yield func(item, *args)
+                raise KeyboardInterrupt
+
+        with patch.object(Catalog, 'CHUNK', 1):
+            with self.assertRaises(KeyboardInterrupt):
+                self.catalog.update([self.img, self.other], Interrupted(1))
+        with Catalog(self.catalog.db_path) as other:
+            self.assertEqual(2, len(other))
+
+    def test_find(self):
+        self.catalog.scan([self.dir], Batch(1))
+        self.assertListEqual([(self.other, "2025-05-01 10:00:00")],
+            self.catalog.find(camera="foo", year=2025))
+        self.assertListEqual([], self.catalog.find(camera="foo", year=2024))
+        self.assertListEqual([self.other],
+            [r[0] for r in self.catalog.find(since="2025-05-01", until="2025-05-01")])
+        self.assertListEqual([self.img], [r[0] for r in self.catalog.find(year=2021)])
+        self.assertListEqual([self.other], [r[0] for r in self.catalog.find(bbox=(48, 11, 49, 12))])
+        self.assertListEqual([], self.catalog.find(bbox=(48, 12, 49, 11)))
+        self.assertEqual(2, len(self.catalog.find()))
+
+    def test_tags(self):
+        self.catalog.scan([self.other], Batch(1))
+        tags = self.catalog.tags(self.other)
+        self.assertEqual('48°8\'13.2"', tags["gps_latitude"])
+        self.assertEqual("_exif_ifd_pointer", next(iter(tags)))
+        self.assertIsNone(self.catalog.tags(self.img))
+
+
+if __name__ == '__main__':
+    unittest.main()
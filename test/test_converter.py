@@ -11,6 +11,16 @@ class TestConverter(unittest.TestCase):
         keys = Converter.keys()
         self.assertTrue(len(keys) > 0)
 
+    def test_is_geoloc(self):
+        self.assertTrue(Converter.is_geoloc("gps_latitude"))
+        self.assertTrue(Converter.is_geoloc("gps_longitude"))
+        self.assertFalse(Converter.is_geoloc("gps_latitude_ref"))
+        self.assertFalse(Converter.is_geoloc("gps_timestamp"))
+
+    def test_is_gps_timestamp(self):
+        self.assertTrue(Converter.is_gps_timestamp("gps_timestamp"))
+        self.assertFalse(Converter.is_gps_timestamp("gps_latitude"))
+
     def test_convert_unknown(self):
         self.assertEqual(1, Converter.to_exif('foo', 1))
 
@@ -58,6 +68,43 @@ class TestConverter(unittest.TestCase):
         res = Converter.group_dict({"b": 1, "a": 2, "exif_version": 22})
         self.assertEqual({"exif_version": 22, "a": 2, "b": 1}, res)
 
+    def test_grouped_dict_order(self):
+        res = Converter.group_dict({"model": 1, "compression": 2, "exif_version": 3, "a": 4})
+        self.assertListEqual(["exif_version", "compression", "a", "model"], list(res))
+
+    def test_to_exif_many(self):
+        res = Converter.to_exif_many({"color_space": "1", "orientation": "RIGHT_TOP", "model": "foo"})
+        self.assertEqual({"color_space": ColorSpace.SRGB, "orientation": Orientation.RIGHT_TOP,
+            "model": "foo"}, res)
+
+    def test_to_exif_enum_member(self):
+        self.assertEqual(ColorSpace.SRGB, Converter.to_exif("color_space", ColorSpace.SRGB))
+
+    def test_to_format_many(self):
+        res = Converter.to_format_many({"color_space": ColorSpace.SRGB, "model": "foo"})
+        self.assertEqual({"color_space": "SRGB", "model": "foo"}, res)
+
+    def test_coerce(self):
+        self.assertEqual(300, Converter.coerce("image_width", " 300", 256))
+        self.assertEqual(72.0, Converter.coerce("x_resolution", "72", 300.0))
+        self.assertEqual(0.004, Converter.coerce("exposure_time", "1/250"))
+        self.assertEqual("SRGB", Converter.coerce("color_space", "1", "SRGB"))
+        self.assertEqual("RIGHT_TOP", Converter.coerce("orientation", "right_top"))
+        self.assertEqual(" foo", Converter.coerce("model", " foo", "bar"))
+        self.assertEqual(12, Converter.coerce("image_width", 12, 256))
+
+    def test_coerce_exported(self):
+        loc = DegreeFormatFactory.create((48.0, 8.0, 13.2))
+        self.assertIs(loc, Converter.coerce("gps_latitude", "48°8'13.2\"", loc))
+        self.assertIs(loc, Converter.coerce("gps_latitude",
+            DegreeFormatFactory.parse("48°8'13.2\""), loc))
+        self.assertEqual((1, 2), Converter.coerce("foo", [1, 2], (1, 2)))
+        self.assertEqual(b"ab", Converter.coerce("foo", "b'ab'", b"ab"))
+
+    def test_coerce_raises_error(self):
+        self.assertRaises(ValueError, lambda: Converter.coerce("image_width", "wide", 256))
+        self.assertRaises(ValueError, lambda: Converter.coerce("orientation", "UPSIDE"))
+
     def test_to_exif_dms(self):
         loc = DegreeFormatFactory.create([78.0, 55.0, 44.33324])
         res = Converter.to_exif('', loc)
@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from exif_edit.batch import Batch, Edits, edit_file
+from exif_edit.export import Exporter, read_tags, serialize
+from exif_edit.formats import DmsFormat
+
+class TestExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        edit_file(self.img, Edits({"gps_latitude": (48, 8, 13.2), "gps_latitude_ref": "N"}))
+        shutil.copy(self.img, os.path.join(self.dir, 'b.jpg'))
+        self.exporter = Exporter(Batch(1))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_serialize(self):
+        self.assertEqual('1°2\'3.0"', serialize(DmsFormat((1, 2, 3))))
+        self.assertEqual(1, serialize(1))
+
+    def test_read_tags(self):
+        _, dic, error = read_tags(self.img)
+        self.assertIsNone(error)
+        self.assertEqual('48°8\'13.2"', dic['gps_latitude'])
+        self.assertEqual('INCHES', dic['resolution_unit'])
+
+    def test_read_tags_failed(self):
+        _, dic, error = read_tags(os.path.join(self.dir, 'c.jpg'))
+        self.assertIsNone(dic)
+        self.assertIsNotNone(error)
+
+    def test_export_csv(self):
+        file = io.StringIO()
+        res = self.exporter.export([self.dir], file)
+
+        rows = list(csv.reader(io.StringIO(file.getvalue())))
+        self.assertEqual(2, res.images)
+        self.assertEqual(res.rows + 1, len(rows))
+        self.assertListEqual(list(Exporter.HEADER), rows[0])
+        self.assertTrue([self.img, 'gps_latitude', '48°8\'13.2"'] in rows)
+
+    def test_export_jsonl(self):
+        file = io.StringIO()
+        res = self.exporter.export([self.img], file, Exporter.JSONL)
+
+        lines = file.getvalue().splitlines()
+        self.assertEqual(1, res.rows)
+        obj = json.loads(lines[0])
+        self.assertEqual(self.img, obj['path'])
+        self.assertEqual(256, obj['tags']['image_width'])
+
+    def test_export_failed(self):
+        errors = []
+        exporter = Exporter(Batch(1), lambda path, error: errors.append(path))
+        broken = os.path.join(self.dir, 'c.jpg')
+        with open(broken, 'wb') as file:
+            file.write(b'\xff\xd8\xff\xe1\x00\x10Exif\x00\x00XXXXXXXX\xff\xd9')
+
+        res = exporter.export([broken, self.img], io.StringIO(), Exporter.JSONL)
+        self.assertEqual((1, 1, 1), res)
+        self.assertListEqual([broken], errors)
+
+    def test_export_unknown_format(self):
+        self.assertRaises(ValueError, lambda: self.exporter.export([self.img], io.StringIO(), 'xml'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from exif_edit.folder import Folder
+
+class TestFolder(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        for name in ['c.jpg', 'a.jpg', 'b.JPEG', 'd.txt']:
+            open(os.path.join(self.dir, name), 'w').close()
+        os.mkdir(os.path.join(self.dir, 'e.jpg'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def __path(self, name):
+        return os.path.join(self.dir, name)
+
+    def test_list_images(self):
+        self.assertListEqual([self.__path('a.jpg'), self.__path('b.JPEG'), self.__path('c.jpg')],
+            Folder.list_images(self.dir))
+
+    def test_current(self):
+        self.assertEqual(self.__path('a.jpg'), Folder(self.dir).current())
+        self.assertEqual(self.__path('b.JPEG'), Folder(self.dir, 'b.JPEG').current())
+
+    def test_empty(self):
+        folder = Folder(os.path.join(self.dir, 'e.jpg'))
+        self.assertIsNone(folder.current())
+        self.assertIsNone(folder.next())
+
+    def test_next_previous(self):
+        folder = Folder(self.dir)
+        self.assertIsNone(folder.previous())
+        self.assertEqual(self.__path('b.JPEG'), folder.next())
+        self.assertEqual(self.__path('c.jpg'), folder.next())
+        self.assertIsNone(folder.next())
+        self.assertEqual(self.__path('b.JPEG'), folder.previous())
+
+    def test_upcoming(self):
+        folder = Folder(self.dir, 'b.JPEG')
+        self.assertListEqual([self.__path('c.jpg')], folder.upcoming(5))
+        folder.previous()
+        self.assertListEqual([], folder.upcoming(5))
+        folder.next()
+        folder.next()
+        folder.previous()
+        self.assertListEqual([self.__path('a.jpg')], folder.upcoming(5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import pickle
 import unittest
 
-from exif_edit.formats import DmsFormat, DecimalFormat, DegreeFormatFactory, TimeStamp
+from exif_edit.formats import DmsFormat, DecimalFormat, DegreeFormatFactory, Format, TimeStamp
 
 class TestFormats(unittest.TestCase):
 
@@ -15,6 +16,12 @@ class TestFormats(unittest.TestCase):
         loc = DmsFormat((78, 55, 44.33324))
         self.assertEqual(loc, DegreeFormatFactory.create(loc))
 
+    def test_equal(self):
+        self.assertEqual(DmsFormat((1, 2, 3)), DegreeFormatFactory.create([1, 2, 3]))
+        self.assertNotEqual(DmsFormat((1, 2, 3)), DmsFormat((1, 2, 4)))
+        self.assertNotEqual(DecimalFormat(1), TimeStamp((1, 0, 0)))
+        self.assertEqual(hash(TimeStamp((1, 2, 3))), hash(TimeStamp.parse("01:02:03")))
+
     def test_dms_to_dd_tuple(self):
         loc = DegreeFormatFactory.create((78, 55, 44.33324))
         self.assertEqual(78.928981, loc.as_float())
@@ -56,5 +63,48 @@ class TestFormats(unittest.TestCase):
         tmt = TimeStamp.parse("15:00:01")
         self.assertEqual("15:00:01", tmt.__repr__())
 
+    def test_timestamp_separator(self):
+        self.assertNotEqual(TimeStamp((1, 2, 3)), TimeStamp((1, 2, 3), '-'))
+        self.assertEqual(TimeStamp((1, 2, 3), '-'), TimeStamp((1, 2, 3), '-'))
+
+    def test_immutable(self):
+        loc = DmsFormat((1, 2, 3))
+        with self.assertRaises(AttributeError):
+            loc.source = (4, 5, 6)
+        with self.assertRaises(AttributeError):
+            loc.foo = 1
+
+    def test_interned(self):
+        self.assertIs(DegreeFormatFactory.create((1, 2, 3)), DegreeFormatFactory.create([1, 2, 3]))
+        self.assertIs(DegreeFormatFactory.parse("30.5°"), DegreeFormatFactory.parse("30.5°"))
+        self.assertIs(TimeStamp.parse((1, 2, 3)), TimeStamp.parse([1, 2, 3]))
+
+    def test_interned_keeps_separator(self):
+        self.assertIsNot(Format.intern(TimeStamp((1, 2, 3))), Format.intern(TimeStamp((1, 2, 3), '-')))
+
+    def test_pickle(self):
+        tmt = TimeStamp((1, 2, 3), '-')
+        res = pickle.loads(pickle.dumps(tmt))
+        self.assertEqual(tmt, res)
+        self.assertEqual("01-02-03", res.__repr__())
+
+    def test_parse_like_search(self):
+        for arg in ("78°55\'44.33324\"", "30.263888889°", "30.°", "30°", "30", "a1°2\'3\"",
+            "-1°2\'3\"", "4711a", "1.5.5"):
+            self.__assert_same(DegreeFormatFactory.parse, DegreeFormatFactory.search, arg)
+        for arg in ("15:00:01", "at 15:00:01", "1:2", "1:2:x"):
+            self.__assert_same(TimeStamp.parse, TimeStamp.search, arg)
+
+    def __assert_same(self, parse, search, arg):
+        try:
+            expected = search(arg)
+        except ValueError:
+            self.assertRaises(ValueError, lambda: parse(arg))
+            return
+        res = parse(arg)
+        self.assertEqual(expected, res)
+        self.assertEqual(expected.__repr__(), res.__repr__())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+
+from exif_edit.formats import DecimalFormat
+from exif_edit.geo_arrays import GeoArrays
+from exif_edit.location import Coordinate
+
+
+class TestGeoArrays(unittest.TestCase):
+
+    def test_to_decimal(self):
+        res = GeoArrays.to_decimal([(78, 55, 44.33324), (30, 15, 50)], ['N', 'S'], 'N')
+        self.assertListEqual([78.928981, -30.263889], res.tolist())
+
+    def test_to_decimal_single(self):
+        res = GeoArrays.to_decimal((78, 55, 44.33324), 'W', 'E')
+        self.assertListEqual([-78.928981], res.tolist())
+
+    def test_to_dms(self):
+        dms, refs = GeoArrays.to_dms([30.263888889, -30.263888889], 'E', 'W')
+        self.assertListEqual([[30, 15, 50], [30, 15, 50]], dms.tolist())
+        self.assertListEqual(['E', 'W'], refs.tolist())
+
+    def test_to_dms_carry(self):
+        dms, _ = GeoArrays.to_dms([0.1, 11.9999999999], 'E', 'W')
+        self.assertListEqual([[0, 6, 0], [12, 0, 0]], dms.tolist())
+
+    def test_decimal_like_coordinate(self):
+        lats = [(50, 42, 49.6746), (57, 30, 20.7126), (77, 0, 21.5514), (1, 2, 3)]
+        lons = [(8, 1, 2.5), (170, 59, 59.99), (0, 0, 0), (12, 30, 0)]
+        lat_refs = ['N', 'S', 'N', 'S']
+        lon_refs = ['E', 'W', 'W', 'E']
+        lat, lon = GeoArrays.decimal(lats, lons, lat_refs, lon_refs)
+
+        expected = [Coordinate(*args).decimal() for args in zip(lats, lons, lat_refs, lon_refs)]
+        self.assertListEqual(expected, list(zip(lat.tolist(), lon.tolist())))
+
+    def test_dms_like_decimal_format(self):
+        values = [48.137154, 11.576124, 0.5, 89.9999995]
+        lat, _, refs, _ = GeoArrays.dms(values, values)
+        self.assertListEqual([DecimalFormat(v).as_tuple() for v in values],
+            [tuple(row) for row in lat.tolist()])
+        self.assertTrue(np.all(refs == 'N'))
+
+    def test_round_ties(self):
+        values = [0.0137985, 2.5, 0.125]
+        self.assertListEqual([round(v, 6) for v in values], GeoArrays.round(values, 6).tolist())
+        self.assertListEqual([round(v, 2) for v in values], GeoArrays.round(values, 2).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+
+from exif_edit.batch import Batch
+from exif_edit.geotag import Geotagger, Track, capture_time, parse_offset
+from exif_edit.image_io import Reader
+from PIL import Image
+
+GPX = b"""<?xml version="1.0"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+<trk><trkseg>
+<trkpt lat="48.2" lon="11.2"><time>2021-01-21T21:31:00Z</time></trkpt>
+<trkpt lat="48.0" lon="11.0"><ele>500</ele><time>2021-01-21T21:29:00Z</time></trkpt>
+<trkpt lat="50.0" lon="12.0"></trkpt>
+</trkseg></trk></gpx>
+"""
+
+class TestTrack(unittest.TestCase):
+
+    def setUp(self):
+        self.track = Track.load(io.BytesIO(GPX))
+        self.start = Track.parse_time("2021-01-21T21:29:00Z")
+
+    def test_load(self):
+        self.assertEqual(2, len(self.track))
+        self.assertListEqual([48.0, 48.2], self.track.latitudes.tolist())
+
+    def test_parse_time(self):
+        self.assertEqual(self.start, Track.parse_time("2021-01-21T23:29:00+02:00"))
+        self.assertEqual(self.start, Track.parse_time("2021-01-21T21:29:00"))
+
+    def test_locate_interpolates(self):
+        lat, lon, matched = self.track.locate([self.start + 60])
+        self.assertAlmostEqual(48.1, lat[0])
+        self.assertAlmostEqual(11.1, lon[0])
+        self.assertTrue(matched[0])
+
+    def test_locate_outside(self):
+        times = [self.start - 30, self.start - 61, self.start + 181, np.nan]
+        lat, _, matched = self.track.locate(times)
+        self.assertEqual(48.0, lat[0])
+        self.assertListEqual([True, False, False, False], matched.tolist())
+
+    def test_locate_empty_track(self):
+        _, _, matched = Track([], [], []).locate([self.start])
+        self.assertFalse(matched[0])
+
+    def test_parse_offset(self):
+        self.assertEqual(7200, parse_offset("+02:00"))
+        self.assertEqual(-5400, parse_offset("-01:30"))
+        self.assertEqual(0, parse_offset(None))
+
+
+class TestGeotagger(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        self.track = Track.load(io.BytesIO(GPX))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def __without_gps(self, name):
+        path = os.path.join(self.dir, name)
+        exif = Image.Exif()
+        exif[0x0132] = '2021:01:21 21:30:00'
+        Image.new('RGB', (8, 8)).save(path, exif=exif)
+        return path
+
+    def test_capture_time(self):
+        _, stamp, error = capture_time(self.img)
+        self.assertEqual(Track.parse_time("2021-01-21T21:30:00Z"), stamp)
+        self.assertIsNone(error)
+        _, stamp, _ = capture_time(self.img, 3600)
+        self.assertEqual(Track.parse_time("2021-01-21T20:30:00Z"), stamp)
+
+    def test_capture_time_missing(self):
+        path = os.path.join(self.dir, 'b.jpg')
+        Image.new('RGB', (8, 8)).save(path)
+        self.assertEqual((path, None, None), capture_time(path))
+
+    def test_capture_time_failed(self):
+        _, stamp, error = capture_time(os.path.join(self.dir, 'c.jpg'))
+        self.assertIsNone(stamp)
+        self.assertIsNotNone(error)
+
+    def test_tag(self):
+        res = list(Geotagger(self.track, batch=Batch(1)).tag([self.dir]))
+        self.assertEqual('saved', res[0].status)
+
+        dic = Reader(self.img).dict()
+        self.assertEqual('N', dic['gps_latitude_ref'])
+        self.assertAlmostEqual(48.1, dic['gps_latitude'].as_float())
+        self.assertAlmostEqual(11.1, dic['gps_longitude'].as_float())
+
+    def test_tag_failed_without_gps_ifd(self):
+        path = self.__without_gps('b.jpg')
+        res = list(Geotagger(self.track, batch=Batch(1)).tag([path]))
+        self.assertEqual('failed', res[0].status)
+        self.assertFalse('gps_latitude' in Reader(path).dict())
+
+    def test_tag_failed_unreadable(self):
+        path = os.path.join(self.dir, 'b.jpg')
+        with open(path, 'wb') as file:
+            file.write(b'\xff\xd8\xff\xe1\x00\x10Exif\x00\x00broken')
+        res = list(Geotagger(self.track, batch=Batch(1)).tag([path]))
+        self.assertEqual('failed', res[0].status)
+
+    def test_tag_unmatched(self):
+        res = list(Geotagger(self.track, 7200, batch=Batch(1)).tag([self.img]))
+        self.assertEqual(Geotagger.UNMATCHED, res[0].status)
+        self.assertFalse('gps_latitude' in Reader(self.img).dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
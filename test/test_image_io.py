@@ -1,8 +1,13 @@
 from exif_edit.converter import Converter
+from PIL import Image
 import unittest
 import os
+from unittest.mock import Mock
+import shutil
+import tempfile
 
-from exif_edit.image_io import ExifFilter, Reader, Writer
+from exif_edit.image_io import ExifFilter, Reader, ReaderCache, WriteError, Writer
+from exif_edit.preview_cache import PreviewCache
 
 class TestImageIO(unittest.TestCase):
 
@@ -14,6 +19,15 @@ class TestImageIO(unittest.TestCase):
         p = self.__path('lookup.jpg')
         self.reader = Reader(p)
         self.writer = Writer(self.reader.binary())
+        #the tests write into a temporary directory, never into the resources
+        self.dir = tempfile.mkdtemp()
+        self.modified = os.path.join(self.dir, 'modified.jpg')
+        self.preview_cache = Reader.preview_cache
+        Reader.preview_cache = PreviewCache(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        Reader.preview_cache = self.preview_cache
+        shutil.rmtree(self.dir)
 
     def test_keys(self):
         self.assertFalse(len(self.reader.keys()) == 0)
@@ -27,6 +41,12 @@ class TestImageIO(unittest.TestCase):
         res = self.reader.dict()
         self.assertFalse(len(res) == 0)
 
+    def test_header_only(self):
+        reader = Reader(self.__path('lookup.jpg'), header_only=True)
+        self.assertTrue(reader.is_header_only())
+        self.assertEqual(repr(self.reader.dict()), repr(reader.dict()))
+        self.assertListEqual(list(self.reader.grouped_dict()), list(reader.grouped_dict()))
+
     def test_grouped_dict(self):
         lst = list(self.reader.grouped_dict().keys())
         k = ExifFilter.read_only()[0]
@@ -34,7 +54,7 @@ class TestImageIO(unittest.TestCase):
 
     def test_save_list(self):
         list = [["model", "bar"]]
-        p = self.__path('modified.jpg')
+        p = self.modified
         self.writer.save(list, p)
 
         keys = Reader(p).keys()
@@ -42,17 +62,143 @@ class TestImageIO(unittest.TestCase):
 
     def test_save_list_deleted_row(self):
         lst = [["model", "bar"], ["software", "python"]]
-        p = self.__path('modified.jpg')
+        p = self.modified
         writer = Writer(self.reader.binary(), Converter.to_dict(lst))
         writer.save([["model", "bar"]], p)
 
         keys = Reader(p).keys()
         self.assertFalse("software" in keys)
 
+    def test_save_unchanged(self):
+        tmp = tempfile.mkdtemp()
+        img = os.path.join(tmp, 'a.jpg')
+        shutil.copy(self.__path('lookup.jpg'), img)
+        reader = Reader(img, header_only=True)
+        dic = reader.dict()
+        stat = os.stat(img)
+
+        writer = Writer(reader.binary(), dict(dic), reader.path, reader.segment)
+        self.assertFalse(writer.save(Converter.to_list(dic), img))
+        self.assertEqual(stat.st_mtime_ns, os.stat(img).st_mtime_ns)
+        shutil.rmtree(tmp)
+
+    def test_save_unchanged_texts(self):
+        tmp = tempfile.mkdtemp()
+        img = os.path.join(tmp, 'a.jpg')
+        shutil.copy(self.__path('lookup.jpg'), img)
+        reader = Reader(img, header_only=True)
+        dic = reader.dict()
+
+        writer = Writer(reader.binary(), dict(dic), reader.path, reader.segment)
+        rows = [[key, str(value)] for key, value in dic.items()]
+        self.assertFalse(writer.save(rows, img))
+        rows[[row[0] for row in rows].index("image_width")][1] = "300"
+        self.assertTrue(writer.save(rows, img))
+        self.assertEqual(300, Reader(img).dict()["image_width"])
+        shutil.rmtree(tmp)
+
+    def test_save_unchanged_to_other_file(self):
+        dic = self.reader.dict()
+        writer = Writer(self.reader.binary(), dict(dic), self.__path('lookup.jpg'))
+        self.assertTrue(writer.save(Converter.to_list(dic), self.modified))
+
+    def test_save_only_changes(self):
+        dic = self.reader.dict()
+        rows = Converter.to_list(dic) + [["model", "bar"]]
+        writer = Writer(self.reader.binary(), dict(dic))
+        writer.converter = Mock(wraps=writer.converter)
+        writer.save(rows, self.modified)
+
+        writer.converter.to_exif_many.assert_called_once_with({"model": "bar"})
+        keys = Reader(self.modified).keys()
+        self.assertTrue(set(dic.keys()).issubset(keys))
+
+    def test_save_header_only(self):
+        lst = [["model", "bar"], ["gps_latitude", (1.0, 2.0, 3.0)]]
+        full = self.modified
+        self.writer.save(lst, full)
+
+        reader = Reader(self.__path('lookup.jpg'), header_only=True)
+        spliced = os.path.join(tempfile.mkdtemp(), 'spliced.jpg')
+        writer = Writer(reader.binary(), None, reader.path, reader.segment)
+        writer.save(lst, spliced)
+
+        with open(full, 'rb') as exp, open(spliced, 'rb') as res:
+            self.assertEqual(exp.read(), res.read())
+        shutil.rmtree(os.path.dirname(spliced))
+
+    def test_save_fails_without_gps_ifd(self):
+        tmp = tempfile.mkdtemp()
+        img = os.path.join(tmp, 'nogps.jpg')
+        exif = Image.Exif()
+        exif[0x010F] = 'foo'
+        Image.new('RGB', (8, 8)).save(img, exif=exif)
+
+        reader = Reader(img, True)
+        dic = reader.dict()
+        writer = Writer(reader.binary(), dict(dic), reader.path, reader.segment)
+        rows = Converter.to_list({**dic, 'gps_latitude_ref': 'N'})
+        with self.assertRaises(WriteError) as ctx:
+            writer.save(rows, img)
+        self.assertListEqual(['gps_latitude_ref'], list(ctx.exception.errors))
+        self.assertFalse('gps_latitude_ref' in Reader(img).dict())
+        shutil.rmtree(tmp)
+
     def test_read_image(self):
         img = Reader.read_image(self.__path('lookup.jpg'), True)
         w, _ = img.size
         self.assertEqual(400, w)
 
+    def test_read_image_cached(self):
+        p = self.__path('lookup.jpg')
+        Reader.read_image(p, True)
+        self.assertIsNotNone(Reader.preview_cache.get(PreviewCache.key(p, 400)))
+        self.assertEqual((400, 354), Reader.read_image(p, True).size)
+
+    def test_read_image_orientation(self):
+        tmp = tempfile.mkdtemp()
+        img = os.path.join(tmp, 'rotated.jpg')
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.new('RGB', (800, 400)).save(img, exif=exif)
+
+        res = Reader.read_image(img, True)
+        self.assertEqual((200, 400), res.size)
+        shutil.rmtree(tmp)
+
+
+class TestReaderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        self.cache = ReaderCache(max_size=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_reuse_reader(self):
+        reader = self.cache.get(self.img)
+        self.assertIs(reader, self.cache.get(self.img))
+
+    def test_file_changed(self):
+        reader = self.cache.get(self.img)
+        stat = os.stat(self.img)
+        os.utime(self.img, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertIsNot(reader, self.cache.get(self.img))
+
+    def test_invalidate(self):
+        reader = self.cache.get(self.img)
+        self.cache.invalidate(self.img)
+        self.assertIsNot(reader, self.cache.get(self.img))
+
+    def test_evict(self):
+        other = os.path.join(self.dir, 'b.jpg')
+        shutil.copy(self.img, other)
+        reader = self.cache.get(self.img)
+        self.cache.get(other)
+        self.assertIsNot(reader, self.cache.get(self.img))
+
 if __name__ == '__main__':
     unittest.main()
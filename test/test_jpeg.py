@@ -0,0 +1,111 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+
+from unittest.mock import patch
+
+from exif_edit.jpeg import EOI, SOI, Jpeg, Segment
+
+class TestJpeg(unittest.TestCase):
+
+    def __path(self, name):
+        img = 'test/resources/' + name
+        return os.path.realpath(img)
+
+    def test_exif_segment(self):
+        with open(self.__path('lookup.jpg'), 'rb') as file:
+            seg = Jpeg.exif_segment(file)
+            #nothing after the segment has been read
+            self.assertEqual(seg.end(), file.tell())
+        self.assertEqual(20, seg.offset)
+        self.assertEqual(b"\xff\xe1", seg.data[:2])
+
+    def test_stub(self):
+        with open(self.__path('lookup.jpg'), 'rb') as file:
+            seg = Jpeg.exif_segment(file)
+        stub = seg.stub()
+        self.assertTrue(stub.startswith(SOI))
+        self.assertTrue(stub.endswith(EOI))
+
+    def test_no_jpeg(self):
+        self.assertIsNone(Jpeg.exif_segment(io.BytesIO(b"\x89PNG")))
+
+    def test_stop_at_scan_data(self):
+        app0 = b"\xff\xe0\x00\x04ab"
+        sos = b"\xff\xda\x00\x02"
+        #the Exif header after the start of scan must not be found
+        data = SOI + app0 + sos + b"\xff\xe1\x00\x08Exif\x00\x00"
+        self.assertIsNone(Jpeg.exif_segment(io.BytesIO(data)))
+
+    def test_skip_other_app1(self):
+        xmp = b"\xff\xe1\x00\x05xmp"
+        exif = b"\xff\xe1\x00\x08Exif\x00\x00"
+        seg = Jpeg.exif_segment(io.BytesIO(SOI + xmp + exif))
+        self.assertEqual(9, seg.offset)
+        self.assertEqual(exif, seg.data)
+
+    def test_splice(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmp, 'src.jpg')
+            with open(src, 'wb') as file:
+                file.write(SOI + b"\xff\xe1\x00\x08Exif\x00\x00" + b"rest" + EOI)
+            with open(src, 'rb') as file:
+                seg = Jpeg.exif_segment(file)
+
+            new = b"\xff\xe1\x00\x09Exif\x00\x00x"
+            Jpeg.splice(src, seg, new, src)
+
+            with open(src, 'rb') as file:
+                self.assertEqual(SOI + new + b"rest" + EOI, file.read())
+            self.assertListEqual(['src.jpg'], os.listdir(tmp))
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_splice_user_space(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmp, 'src.jpg')
+            with open(src, 'wb') as file:
+                file.write(SOI + b"\xff\xe1\x00\x08Exif\x00\x00" + b"rest" + EOI)
+            new = b"\xff\xe1\x00\x09Exif\x00\x00x"
+            #the kernel copies nothing, like some file systems do
+            with patch.object(Jpeg, '_Jpeg__copy_range', return_value=0):
+                Jpeg.splice(src, Segment(2, b"\xff\xe1\x00\x08Exif\x00\x00"), new, src)
+
+            with open(src, 'rb') as file:
+                self.assertEqual(SOI + new + b"rest" + EOI, file.read())
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_splice_short_source(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            src = os.path.join(tmp, 'src.jpg')
+            origin = SOI + b"\xff\xe1\x00\x08Exif\x00\x00" + EOI
+            with open(src, 'wb') as file:
+                file.write(origin)
+            #a segment behind the end of the file
+            with self.assertRaises(OSError):
+                Jpeg.splice(src, Segment(len(origin) + 10, b"\xff\xe1\x00\x02"), b"", src)
+
+            with open(src, 'rb') as file:
+                self.assertEqual(origin, file.read())
+            self.assertListEqual(['src.jpg'], os.listdir(tmp))
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_splice_missing_source(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            with self.assertRaises(OSError):
+                Jpeg.splice(os.path.join(tmp, 'missing.jpg'), Segment(2, b""), b"",
+                    os.path.join(tmp, 'target.jpg'))
+            self.assertListEqual([], os.listdir(tmp))
+        finally:
+            shutil.rmtree(tmp)
+
+if __name__ == '__main__':
+    unittest.main()
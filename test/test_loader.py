@@ -0,0 +1,150 @@
+import unittest
+import os
+import shutil
+import tempfile
+
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+from PIL import Image
+
+from exif_edit.loader import Loader, Prefetcher
+
+class ImmediateExecutor:
+
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.tasks.append((future, fn, args))
+        return future
+
+    def run(self):
+        for future, fn, args in self.tasks:
+            if future.set_running_or_notify_cancel():
+                future.set_result(fn(*args))
+        self.tasks = []
+
+class TestLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.mediator = Mock()
+        self.mediator.read_exif.return_value = {'model': 'foo'}
+        self.mediator.read_image.return_value = 'img'
+        self.executor = ImmediateExecutor()
+        self.loader = Loader(self.mediator, self.executor)
+
+    def test_load(self):
+        self.loader.load('a.jpg')
+        self.assertTrue(self.loader.is_loading())
+        self.executor.run()
+
+        res = self.loader.poll()
+        self.assertListEqual([(Loader.EXIF, 'a.jpg', {'model': 'foo'}),
+            (Loader.PREVIEW, 'a.jpg', 'img')], res)
+        self.assertFalse(self.loader.is_loading())
+
+    def test_load_error(self):
+        self.mediator.read_exif.side_effect = OSError('missing')
+        self.loader.load('a.jpg')
+        self.executor.run()
+
+        res = self.loader.poll()
+        self.assertEqual(1, len(res))
+        self.assertEqual(Loader.ERROR, res[0][0])
+        self.mediator.read_image.assert_not_called()
+
+    def test_cancel_pending_load(self):
+        self.loader.load('a.jpg')
+        self.loader.load('b.jpg')
+        self.executor.run()
+
+        res = self.loader.poll()
+        self.assertListEqual(['b.jpg', 'b.jpg'], [r[1] for r in res])
+        self.mediator.read_exif.assert_called_once_with('b.jpg')
+
+    def test_drop_stale_results(self):
+        self.loader.load('a.jpg')
+        #a new image is opened, while the first one is read
+        self.mediator.read_exif.side_effect = lambda p: self.loader.cancel()
+        self.executor.run()
+
+        self.assertListEqual([], self.loader.poll())
+        self.mediator.read_image.assert_not_called()
+
+    def test_load_prefetched(self):
+        prefetcher = Mock()
+        prefetcher.get.return_value = ({'model': 'bar'}, 'preview')
+        loader = Loader(self.mediator, self.executor, prefetcher)
+        loader.load('a.jpg')
+        self.executor.run()
+
+        self.assertListEqual([(Loader.EXIF, 'a.jpg', {'model': 'bar'}),
+            (Loader.PREVIEW, 'a.jpg', 'preview')], loader.poll())
+        self.mediator.read_exif.assert_not_called()
+
+class TestPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.paths = []
+        for name in ['a.jpg', 'b.jpg', 'c.jpg']:
+            path = os.path.join(self.dir, name)
+            open(path, 'w').close()
+            self.paths.append(path)
+
+        self.mediator = Mock()
+        self.mediator.read_exif.side_effect = lambda p: {'path': p}
+        #every preview takes 100 * 100 * 3 bytes
+        self.mediator.read_image.side_effect = lambda p: Image.new('RGB', (100, 100))
+        self.executor = ImmediateExecutor()
+        self.prefetcher = Prefetcher(self.mediator, 70000, self.executor)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_prefetch(self):
+        self.prefetcher.prefetch(self.paths[:2])
+        self.assertIsNone(self.prefetcher.get(self.paths[0]))
+        self.executor.run()
+
+        dic, img = self.prefetcher.get(self.paths[0])
+        self.assertDictEqual({'path': self.paths[0]}, dic)
+        self.assertEqual((100, 100), img.size)
+
+    def test_prefetch_once(self):
+        self.prefetcher.prefetch(self.paths[:1])
+        self.executor.run()
+        self.prefetcher.prefetch(self.paths[:1])
+        self.executor.run()
+        self.mediator.read_exif.assert_called_once()
+
+    def test_cancel_outdated(self):
+        self.prefetcher.prefetch(self.paths[:1])
+        self.prefetcher.prefetch(self.paths[1:2])
+        self.executor.run()
+        self.mediator.read_exif.assert_called_once_with(self.paths[1])
+
+    def test_budget(self):
+        self.prefetcher.prefetch(self.paths[:2])
+        self.executor.run()
+        #use a, so that b is the least recently used one
+        self.prefetcher.get(self.paths[0])
+        self.prefetcher.prefetch(self.paths[2:])
+        self.executor.run()
+
+        self.assertIsNone(self.prefetcher.get(self.paths[1]))
+        self.assertIsNotNone(self.prefetcher.get(self.paths[0]))
+        self.assertIsNotNone(self.prefetcher.get(self.paths[2]))
+        self.assertTrue(self.prefetcher.used <= 70000)
+
+    def test_file_changed(self):
+        self.prefetcher.prefetch(self.paths[:1])
+        self.executor.run()
+        with open(self.paths[0], 'w') as file:
+            file.write('changed')
+        self.assertIsNone(self.prefetcher.get(self.paths[0]))
+
+if __name__ == '__main__':
+    unittest.main()
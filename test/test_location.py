@@ -1,6 +1,8 @@
 import unittest
 
-from exif_edit.location import Coordinate
+from unittest.mock import Mock
+
+from exif_edit.location import Coordinate, Location
 
 class TestLocation(unittest.TestCase):
 
@@ -18,5 +20,39 @@ class TestLocation(unittest.TestCase):
         expected = 'https://www.google.com/maps/place/30.263889+30.263889/@30.263889,30.263889,10z'
         self.assertEqual(expected, self.coord.google_maps_url())
 
+    def test_find(self):
+        tags = {'gps_latitude': 30.5, 'gps_longitude': 10.25, 'gps_longitude_ref': 'W'}
+        self.assertEqual((30.5, -10.25), Coordinate.find(tags.get).decimal())
+
+    def test_find_missing(self):
+        self.assertIsNone(Coordinate.find({'gps_latitude': 30.5}.get))
+
+class TestLocationChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.tags = {'gps_latitude': 30.263888889, 'gps_longitude': 30.263888889}
+        self.lookup = Mock(side_effect=self.tags.get)
+        self.location = Location(self.lookup)
+
+    def test_coordinate(self):
+        self.assertIsNotNone(self.location.coordinate())
+        count = self.lookup.call_count
+        self.location.coordinate()
+        self.assertEqual(count, self.lookup.call_count)
+
+    def test_coordinate_default_refs(self):
+        self.assertEqual((30.263889, 30.263889), self.location.coordinate().decimal())
+
+    def test_unrelated_change(self):
+        coord = self.location.coordinate()
+        self.location.changed('model', None)
+        self.assertIs(coord, self.location.coordinate())
+
+    def test_related_change(self):
+        self.location.coordinate()
+        del self.tags['gps_longitude']
+        self.location.changed('model', 'gps_longitude')
+        self.assertIsNone(self.location.coordinate())
+
 if __name__ == '__main__':
     unittest.main()
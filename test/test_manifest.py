@@ -0,0 +1,93 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from exif_edit.batch import Batch, edit_file, Edits
+from exif_edit.export import Exporter
+from exif_edit.image_io import Reader
+from exif_edit.manifest import Manifest
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_load_csv(self):
+        file = io.StringIO("path,key,value\na.jpg,model,foo\nb.jpg,make,bar\na.jpg,artist,me\n")
+        manifest = Manifest.load(file)
+        self.assertEqual(2, len(manifest))
+        self.assertEqual(3, manifest.rows)
+        self.assertDictEqual({"model": "foo", "artist": "me"}, manifest.edits["a.jpg"][0])
+
+    def test_load_csv_columns(self):
+        with self.assertRaises(ValueError):
+            Manifest.load(io.StringIO("path,tag\na.jpg,model\n"))
+
+    def test_load_jsonl(self):
+        lines = [{"path": "a.jpg", "key": "model", "value": "foo"},
+            {"path": "a.jpg", "key": "artist", "value": None},
+            {"path": "b.jpg", "tags": {"make": "bar"}}]
+        file = io.StringIO("\n".join(json.dumps(line) for line in lines))
+        manifest = Manifest.load(file, Manifest.JSONL)
+        self.assertEqual(({"model": "foo"}, ["artist"]), manifest.edits["a.jpg"])
+        self.assertDictEqual({"make": "bar"}, manifest.edits["b.jpg"][0])
+
+    def test_load_jsonl_path(self):
+        with self.assertRaises(ValueError):
+            Manifest.load(io.StringIO('{"key": "model"}'), Manifest.JSONL)
+
+    def test_skipped(self):
+        manifest = Manifest()
+        manifest.add("a.jpg", "exif_version", "0220")
+        manifest.add("a.jpg", "image_width", None)
+        manifest.add("a.jpg", "model", "foo")
+        self.assertEqual(2, manifest.skipped)
+        self.assertEqual(({"model": "foo"}, []), manifest.edits["a.jpg"])
+
+    def test_apply(self):
+        manifest = Manifest()
+        manifest.add(self.img, "model", "foo")
+        manifest.add(self.img, "artist", "me")
+        manifest.add(os.path.join(self.dir, 'b.jpg'), "model", "bar")
+
+        res = sorted(manifest.apply(Batch(1)))
+        self.assertListEqual(["saved", "failed"], [r.status for r in res])
+        self.assertEqual("foo", Reader(self.img).value("model"))
+        self.assertEqual("me", Reader(self.img).value("artist"))
+
+    def test_apply_export_unchanged(self):
+        edit_file(self.img, Edits({"gps_latitude": (48, 8, 13.2), "gps_latitude_ref": "N"}))
+        for fmt in (Manifest.CSV, Manifest.JSONL):
+            file = io.StringIO()
+            Exporter(Batch(1)).export([self.img], file, fmt)
+            file.seek(0)
+            res = list(Manifest.load(file, fmt).apply(Batch(1)))
+            self.assertListEqual(["unchanged"], [r.status for r in res])
+
+    def test_apply_wrong_type(self):
+        manifest = Manifest.load(io.StringIO(f"path,key,value\n{self.img},image_width,wide\n"))
+        res = list(manifest.apply(Batch(1)))
+        self.assertEqual("failed", res[0].status)
+        self.assertTrue("image_width" in res[0].error)
+
+    def test_apply_unparseable(self):
+        other = os.path.join(self.dir, 'b.jpg')
+        shutil.copy(self.img, other)
+        manifest = Manifest.load(io.StringIO(
+            f"path,key,value\n{self.img},gps_latitude,garbage\n{other},artist,me\n"))
+        res = {r.path: r for r in manifest.apply(Batch(1))}
+        self.assertEqual("failed", res[self.img].status)
+        self.assertTrue("gps_latitude" in res[self.img].error)
+        self.assertEqual("saved", res[other].status)
+        self.assertEqual("me", Reader(other).value("artist"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,15 @@
 from exif_edit.formats import DegreeFormatFactory
 import unittest
 import os
+import shutil
+import tempfile
 
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 from tksheet import Sheet
 
-from exif_edit.mediator import Mediator
+from exif_edit.image_io import Reader
+from exif_edit.mediator import KeyIndex, Mediator
+from exif_edit.preview_cache import PreviewCache
 
 class TestMediator(unittest.TestCase):
 
@@ -16,10 +20,26 @@ class TestMediator(unittest.TestCase):
     def __train_sheet_for_data(self, data):
         self.sheet.get_total_rows.return_value = len(data)
         self.sheet.get_sheet_data.return_value = data
+        self.sheet.get_column_data.return_value = [row[0] for row in data]
+        self.sheet.get_cell_data.side_effect = lambda r, c: data[r][c]
+        self.mediator.reindex()
+
+    def __train_sheet_for_keys(self, keys):
+        self.sheet.get_total_rows.return_value = len(keys)
+        self.sheet.get_column_data.return_value = keys
+        self.mediator.reindex()
 
     def setUp(self):
         self.sheet = Mock(name='sheet', spec=Sheet)
+        self.sheet.get_total_rows.return_value = 0
+        self.sheet.get_column_data.return_value = []
         self.mediator = Mediator(self.sheet)
+        #the tests write into a temporary directory, never into the resources
+        self.dir = tempfile.mkdtemp()
+        self.modified = os.path.join(self.dir, 'modified.jpg')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
 
     def test_add(self):
         self.mediator.add_row()
@@ -27,6 +47,7 @@ class TestMediator(unittest.TestCase):
 
     def test_insert_row(self):
         self.sheet.get_total_rows.return_value = 1
+        self.sheet.get_column_data.return_value = ["model"]
         self.sheet.get_selected_rows.return_value = {0}
         self.mediator.insert_row()
         self.assertTrue(self.mediator.has_rows())
@@ -35,29 +56,30 @@ class TestMediator(unittest.TestCase):
     def test_insert_row_after_selected_cell(self):
         self.sheet.get_selected_rows.return_value = {}
         self.sheet.get_selected_cells.return_value = {(0,1)}
+        self.__train_sheet_for_keys(["model"])
         self.mediator.insert_row()
         self.sheet.insert_row.assert_called_with(idx=1, redraw=True)
 
     def test_remove_row_selected_row(self):
         self.sheet.get_selected_rows.return_value = [0]
-        self.sheet.get_column_data = Mock(return_value=[[0]])
+        self.__train_sheet_for_keys(["model"])
 
         self.mediator.remove_row()
 
         expected_calls = [self.sheet.get_selected_rows, self.sheet.get_column_data,
-            self.sheet.get_cell_data, self.sheet.delete_row, self.sheet.refresh]
+            self.sheet.delete_row, self.sheet.refresh]
         self.sheet.mock_calls = expected_calls
         self.sheet.delete_row.assert_called_with(0, True)
 
     def test_remove_row_selected_cell(self):
         self.sheet.get_selected_rows.return_value = {}
         self.sheet.get_selected_cells.return_value = {(0,1)}
-        self.sheet.get_column_data = Mock(return_value=[[0]])
+        self.__train_sheet_for_keys(["model"])
 
         self.mediator.remove_row()
 
         expected_calls = [self.sheet.get_selected_rows, self.sheet.get_column_data,
-            self.sheet.get_cell_data, self.sheet.delete_row, self.sheet.refresh]
+            self.sheet.delete_row, self.sheet.refresh]
         self.sheet.mock_calls = expected_calls
         self.sheet.delete_row.assert_called_with(0, True)
 
@@ -69,12 +91,46 @@ class TestMediator(unittest.TestCase):
             self.sheet.readonly_rows, self.sheet.readonly_cells]
         self.sheet.mock_calls = expected_calls
 
+    def test_replace_rows(self):
+        self.sheet.get_total_rows.return_value = 2
+        self.mediator.show_exif('a.jpg', {"exif_version": "220", "image_width": 1, "model": "bar"})
+
+        self.sheet.delete_row.assert_not_called()
+        self.sheet.readonly_rows.assert_any_call([0, 1], readonly=False)
+        self.sheet.dehighlight_all.assert_called_once()
+        self.sheet.readonly_rows.assert_called_with([0])
+        self.sheet.readonly_cells.assert_called_with(cells=[(1, 0)])
+        self.sheet.set_sheet_data.assert_called_once_with(
+            [["exif_version", "220"], ["image_width", 1], ["model", "bar"]], redraw=True)
+
+    def test_read_exif(self):
+        dic = self.mediator.read_exif(self.__path('lookup.jpg'))
+        self.assertEqual('_exif_ifd_pointer', list(dic.keys())[0])
+        self.sheet.set_sheet_data.assert_not_called()
+
     def test_save_exif(self):
         self.sheet.get_total_rows.return_value = 0
         self.mediator.append_exif(self.__path('lookup.jpg'))
         self.sheet.get_sheet_data.return_value = [["model", "bar"]]
 
-        self.mediator.save_exif(self.__path('modified.jpg'))
+        self.mediator.save_exif(self.modified)
+
+    def test_save_exif_reuses_parsed_image(self):
+        self.sheet.get_total_rows.return_value = 0
+        self.mediator.append_exif(self.__path('lookup.jpg'))
+        self.sheet.get_sheet_data.return_value = [["model", "bar"]]
+
+        with patch('exif_edit.image_io.Reader') as reader:
+            self.mediator.save_exif(self.modified)
+            reader.assert_not_called()
+
+    def test_folder(self):
+        self.assertIsNone(self.mediator.next_image())
+        self.assertListEqual([], self.mediator.upcoming_images(2))
+
+        img = self.mediator.open_folder(os.path.dirname(self.__path('lookup.jpg')))
+        self.assertEqual(self.__path('lookup.jpg'), img)
+        self.assertIsNone(self.mediator.previous_image())
 
     def test_keep_origin(self):
         self.mediator.begin_edit_cell((0,0))
@@ -82,14 +138,25 @@ class TestMediator(unittest.TestCase):
 
     def test_restore_origin(self):
         self.sheet.get_cell_data = Mock(return_value="exif_version")
-        self.sheet.get_column_data = Mock(return_value=["exif_version", "exif_version"])
+        self.__train_sheet_for_keys(["exif_version", "exif_version"])
 
         self.mediator.begin_edit_cell((0,0))
         self.mediator.end_edit_cell((0,0))
         self.sheet.set_cell_data.assert_called()
 
+    def test_no_duplicate_after_rename(self):
+        self.__train_sheet_for_keys(["model", "make"])
+        self.mediator.reindex()
+        self.sheet.get_cell_data = Mock(return_value="software")
+
+        self.mediator.begin_edit_cell((1,0))
+        self.mediator.end_edit_cell((1,0))
+        self.sheet.set_cell_data.assert_not_called()
+        self.assertEqual(1, self.mediator.index.row("software"))
+
     def test_restore_origin_not_whitespace(self):
         self.sheet.get_cell_data = Mock(return_value="")
+        self.__train_sheet_for_keys(["model"])
 
         self.mediator.end_edit_cell((0,0))
         self.sheet.set_cell_data.assert_not_called()
@@ -109,6 +176,7 @@ class TestMediator(unittest.TestCase):
 
     def test_get_remove_button_state(self):
         self.sheet.get_selected_rows = Mock(return_value= [0])
+        self.__train_sheet_for_keys(["model"])
         event = ('select_row', (0,))
         self.assertTrue(self.mediator.can_remove_row(event))
 
@@ -145,13 +213,77 @@ class TestMediator(unittest.TestCase):
         self.__train_sheet_for_data(data)
         self.assertTrue(self.mediator.has_location())
 
+    def test_location_cached(self):
+        deg = DegreeFormatFactory.create((1,1,1))
+        data = [["gps_latitude", deg], ["gps_longitude", deg], ["model", "bar"]]
+        self.__train_sheet_for_data(data)
+        self.assertTrue(self.mediator.has_location())
+
+        #edit of an unrelated tag
+        self.sheet.get_cell_data.reset_mock()
+        self.mediator.end_edit_cell((2,1))
+        self.assertTrue(self.mediator.has_location())
+        self.sheet.get_cell_data.assert_called_with(2, 1)
+
+        #the coordinate is gone, after the longitude was removed
+        self.mediator.begin_edit_cell((1,0))
+        data[1][0] = "gps_foo"
+        self.mediator.end_edit_cell((1,0))
+        self.assertFalse(self.mediator.has_location())
+
+    def test_location_after_rc_delete(self):
+        deg = DegreeFormatFactory.create((1,1,1))
+        data = [["gps_latitude", deg], ["gps_longitude", deg]]
+        self.__train_sheet_for_data(data)
+        self.assertTrue(self.mediator.has_location())
+
+        #the table deletes the row itself and reports it by its end_rc_delete_row event
+        del data[1]
+        self.sheet.get_total_rows.return_value = len(data)
+        self.sheet.get_column_data.return_value = [row[0] for row in data]
+        self.mediator.reindex()
+        self.assertFalse(self.mediator.has_location())
+
     def test_read_image(self):
-        with Mediator.read_image(self.__path('lookup.jpg')) as img:
-            self.assertIsNotNone(img)
+        with patch.object(Reader, 'preview_cache', PreviewCache(max_bytes=0)):
+            with Mediator.read_image(self.__path('lookup.jpg')) as img:
+                self.assertIsNotNone(img)
+
+    def test_icon_path(self):
+        self.assertTrue(os.path.isfile(Mediator.icon_path("exit.png")))
 
-    def test_read_icon(self):
-        with Mediator.read_icon("exit.png") as icon:
-            self.assertIsNotNone(icon)
+class TestKeyIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = KeyIndex(["model", "make", "model"])
+
+    def test_lookup(self):
+        self.assertEqual(3, len(self.index))
+        self.assertEqual("make", self.index.key(1))
+        self.assertIsNone(self.index.key(3))
+        self.assertEqual(0, self.index.row("model"))
+        self.assertIsNone(self.index.row("software"))
+        self.assertEqual(2, self.index.count("model"))
+
+    def test_insert(self):
+        self.index.insert(1, "software")
+        self.assertEqual(1, self.index.row("software"))
+        self.assertEqual(2, self.index.row("make"))
+
+    def test_delete(self):
+        self.index.delete(0)
+        self.assertEqual(1, self.index.row("model"))
+        self.assertEqual(1, self.index.count("model"))
+
+    def test_update(self):
+        self.assertEqual(0, self.index.row("model"))
+        self.index.update(0, "software")
+        self.assertEqual(2, self.index.row("model"))
+        self.assertEqual(0, self.index.row("software"))
+        self.assertEqual(1, self.index.count("model"))
+        self.index.update(2, "software")
+        self.assertEqual(0, self.index.count("model"))
+        self.assertIsNone(self.index.row("model"))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+
+from unittest.mock import Mock, patch
+
+from PIL import Image
+
+from exif_edit.preview_cache import PreviewCache
+
+class TestPreviewCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        self.cache = PreviewCache(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(PreviewCache.key(self.img, 400)))
+
+    def test_put_get(self):
+        key = PreviewCache.key(self.img, 400)
+        self.cache.put(key, Image.new('RGB', (40, 30)))
+        self.assertEqual((40, 30), self.cache.get(key).size)
+
+    def test_put_converts_to_rgb(self):
+        key = PreviewCache.key(self.img, 400)
+        self.cache.put(key, Image.new('CMYK', (40, 30)))
+        img = self.cache.get(key)
+        self.assertEqual('RGB', img.mode)
+        self.assertEqual((40, 30), img.size)
+
+    def test_put_failed(self):
+        img = Mock(mode='RGB')
+        img.save.side_effect = OSError("disk full")
+        with self.assertLogs(level='WARNING'):
+            self.cache.put('a', img)
+        self.assertListEqual([], os.listdir(self.cache.directory))
+
+    def test_key(self):
+        key = PreviewCache.key(self.img, 400)
+        self.assertNotEqual(key, PreviewCache.key(self.img, 200))
+
+        stat = os.stat(self.img)
+        os.utime(self.img, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        self.assertNotEqual(key, PreviewCache.key(self.img, 400))
+
+    def test_disabled(self):
+        cache = PreviewCache(self.cache.directory, max_bytes=0)
+        cache.put('a', Image.new('RGB', (40, 30)))
+        self.assertIsNone(cache.get('a'))
+        self.assertFalse(os.path.exists(self.cache.directory))
+
+    def test_size_variable(self):
+        with patch.dict(os.environ, {PreviewCache.SIZE_VARIABLE: '2'}):
+            self.assertEqual(2 * 1024 * 1024, PreviewCache(self.cache.directory).max_bytes)
+        with patch.dict(os.environ, {PreviewCache.SIZE_VARIABLE: '0'}):
+            self.assertFalse(PreviewCache(self.cache.directory).enabled())
+        with patch.dict(os.environ, {PreviewCache.SIZE_VARIABLE: 'big'}):
+            with self.assertLogs(level='WARNING'):
+                self.assertEqual(64 * 1024 * 1024, PreviewCache(self.cache.directory).max_bytes)
+
+    def test_put_threads(self):
+        img = Image.new('RGB', (64, 64))
+        self.cache.put('first', img)
+        size = os.path.getsize(os.path.join(self.cache.directory, 'first'))
+        cache = PreviewCache(self.cache.directory, max_bytes=size * 10)
+        threads = [threading.Thread(target=lambda i=i: [cache.put(f"{i}_{j}", img) for j in range(20)])
+            for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        entries = [e for e in os.scandir(cache.directory)]
+        self.assertEqual(sum(e.stat().st_size for e in entries), cache.total)
+        self.assertTrue(cache.total <= cache.max_bytes)
+
+    def test_evict_least_recently_used(self):
+        img = Image.new('RGBA', (64, 64))
+        self.cache.put('a', img)
+        size = os.path.getsize(os.path.join(self.cache.directory, 'a'))
+        cache = PreviewCache(self.cache.directory, max_bytes=int(size * 3.5))
+        cache.put('b', img)
+        cache.put('c', img)
+        for i, key in enumerate(['a', 'b', 'c']):
+            os.utime(os.path.join(cache.directory, key), ns=(i, i))
+        #a is used again
+        self.assertIsNotNone(cache.get('a'))
+
+        cache.put('d', img)
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNone(cache.get('c'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('d'))
+
+    def test_clear(self):
+        self.cache.put('a', Image.new('RGB', (40, 30)))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from exif_edit.batch import Batch, Edits, edit_file
+from exif_edit.spatial import SpatialIndex, read_coordinate
+
+class TestSpatialIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        #Munich, Augsburg, Berlin and two points around the 180th meridian
+        self.index = SpatialIndex(["m", "a", "b", "e", "w"],
+            [48.137, 48.371, 52.520, -17.0, -17.0],
+            [11.575, 10.898, 13.405, 179.99, -179.99])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_within(self):
+        res = self.index.within(48.137, 11.575, 100)
+        self.assertListEqual(["m", "a"], [r[0] for r in res])
+        self.assertAlmostEqual(0.0, res[0][3])
+        self.assertTrue(50 < res[1][3] < 60)
+
+    def test_within_across_meridian(self):
+        res = self.index.within(-17.0, 179.9, 20)
+        self.assertListEqual(["e", "w"], [r[0] for r in res])
+
+    def test_within_pole(self):
+        self.assertListEqual([], self.index.within(90, 0, 100))
+
+    def test_bbox(self):
+        res = self.index.bbox(48, 10, 49, 12)
+        self.assertListEqual(["a", "m"], sorted(r[0] for r in res))
+
+    def test_bbox_across_meridian(self):
+        res = self.index.bbox(-18, 179, -16, -179)
+        self.assertListEqual(["e", "w"], sorted(r[0] for r in res))
+
+    def test_distance(self):
+        dist = SpatialIndex.distance(0, 0, [0], [1])
+        self.assertAlmostEqual(111.195, dist[0], places=3)
+
+    def test_save_load(self):
+        path = os.path.join(self.dir, 'index.npz')
+        self.index.save(path)
+        res = SpatialIndex.load(path)
+        self.assertListEqual(sorted(self.index.paths), sorted(res.paths))
+        self.assertEqual(self.index.within(52.5, 13.4, 5), res.within(52.5, 13.4, 5))
+
+    def test_empty(self):
+        path = os.path.join(self.dir, 'index.npz')
+        SpatialIndex([], [], []).save(path)
+        self.assertEqual(0, len(SpatialIndex.load(path)))
+
+    def test_build(self):
+        img = os.path.join(self.dir, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), img)
+        shutil.copy(img, os.path.join(self.dir, 'b.jpg'))
+        edit_file(img, Edits({"gps_latitude": (48, 8, 13.2), "gps_latitude_ref": "N",
+            "gps_longitude": (11, 34, 30), "gps_longitude_ref": "W"}))
+
+        self.assertIsNone(read_coordinate(os.path.join(self.dir, 'b.jpg'))[1])
+        broken = os.path.join(self.dir, 'c.jpg')
+        with open(broken, 'wb') as file:
+            file.write(b'\xff\xd8\xff\xe1\x00\x10Exif\x00\x00garbage!')
+        self.assertEqual((broken, None), read_coordinate(broken))
+        index = SpatialIndex.build([self.dir], Batch(1))
+        self.assertListEqual([img], index.paths)
+        self.assertAlmostEqual(-11.575, index.longitudes[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
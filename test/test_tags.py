@@ -0,0 +1,34 @@
+import unittest
+from exif import ColorSpace
+
+from exif_edit.formats import TimeStamp
+from exif_edit.tags import EDITABLE, NOT_DELETABLE, READ_ONLY, TAGS
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_group(self):
+        self.assertEqual(READ_ONLY, TAGS.group("exif_version"))
+        self.assertEqual(NOT_DELETABLE, TAGS.group("image_width"))
+        self.assertEqual(EDITABLE, TAGS.group("model"))
+
+    def test_is_read_only(self):
+        self.assertTrue(TAGS.is_read_only("_gps_ifd_pointer"))
+        self.assertFalse(TAGS.is_read_only("compression"))
+
+    def test_is_locked(self):
+        self.assertTrue(TAGS.is_locked("_exif_ifd_pointer"))
+        self.assertTrue(TAGS.is_locked("compression"))
+        self.assertFalse(TAGS.is_locked("model"))
+
+    def test_enum(self):
+        self.assertEqual(ColorSpace, TAGS.enum("color_space"))
+        self.assertIsNone(TAGS.enum("model"))
+
+    def test_formatter(self):
+        self.assertEqual(TimeStamp.parse, TAGS.formatter("gps_timestamp"))
+        self.assertIsNone(TAGS.formatter("model"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from exif_edit.tracing import Tracer, traced
+
+class Sample:
+
+    @traced
+    def twice(self, value):
+        return self.__add(value, value)
+
+    @staticmethod
+    @traced
+    def __add(first, second):
+        return first + second
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOOKUP = os.path.join(ROOT, "test", "resources", "lookup.jpg")
+
+class TestTracer(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer()
+
+    def tearDown(self):
+        self.tracer.uninstall()
+
+    def test_not_installed(self):
+        self.assertEqual("twice", Sample.__dict__["twice"].__name__)
+        self.assertFalse(hasattr(Sample.__dict__["twice"], "__wrapped__"))
+
+    def test_install(self):
+        self.tracer.install()
+        self.assertEqual(4, Sample().twice(2))
+        names = [e["name"] for e in self.tracer.events]
+        self.assertListEqual(["Sample.__add", "Sample.twice"], names)
+
+    def test_uninstall(self):
+        original = Sample.__dict__["twice"]
+        self.tracer.install()
+        self.tracer.uninstall()
+        Sample().twice(2)
+        self.assertIs(original, Sample.__dict__["twice"])
+        self.assertListEqual([], self.tracer.events)
+
+    def test_exception(self):
+        self.tracer.install()
+        with self.assertRaises(TypeError):
+            Sample().twice(None)
+        self.assertEqual(2, len(self.tracer.events))
+
+    def test_save(self):
+        self.tracer.install()
+        Sample().twice(1)
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        self.tracer.save(path)
+        with open(path, encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+        os.remove(path)
+        self.assertEqual("M", events[0]["ph"])
+        span = events[-1]
+        self.assertEqual("X", span["ph"])
+        self.assertTrue(span["dur"] >= 0)
+
+    def test_install_before_import(self):
+        #a new interpreter, because the traced modules are already imported by other tests
+        code = ("from exif_edit.tracing import Tracer; tracer = Tracer(); tracer.install(); "
+            "from exif_edit.image_io import Reader; Reader(r'%s', True).dict(); "
+            "print(len(tracer.events))" % LOOKUP)
+        res = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+            text=True, check=True)
+        self.assertTrue(int(res.stdout) > 0)
+
+    def test_trace_option(self):
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        subprocess.run([sys.executable, "__main__.py", "--trace", path, "export", LOOKUP,
+            "--output", os.devnull, "--workers", "1"], cwd=ROOT, capture_output=True, check=True)
+        with open(path, encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+        os.remove(path)
+        names = {e["name"] for e in events if e["ph"] == "X"}
+        self.assertTrue(len(names) > 0)
+        self.assertTrue(any(name.startswith("Reader.") for name in names))
+
+if __name__ == '__main__':
+    unittest.main()
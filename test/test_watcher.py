@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from exif_edit.batch import Batch, Edits, edit_file
+from exif_edit.catalog import Catalog
+from exif_edit.watcher import Watcher
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.watched = os.path.join(self.dir, 'in')
+        os.makedirs(os.path.join(self.watched, 'sub'))
+        self.img = os.path.join(self.watched, 'a.jpg')
+        shutil.copy(os.path.realpath('test/resources/lookup.jpg'), self.img)
+        self.catalog = Catalog(os.path.join(self.dir, 'catalog.db'))
+        self.watcher = Watcher(self.catalog, [self.watched], 0.01, Batch(1))
+
+    def tearDown(self):
+        self.catalog.close()
+        shutil.rmtree(self.dir)
+
+    def test_scan(self):
+        nested = os.path.join(self.watched, 'sub', 'b.JPG')
+        shutil.copy(self.img, nested)
+        open(os.path.join(self.watched, 'c.txt'), 'w').close()
+
+        self.assertListEqual([self.img, nested], sorted(Watcher.scan([self.watched])))
+
+    def test_diff(self):
+        old = {'a': (1, 1), 'b': (1, 1), 'c': (1, 1)}
+        new = {'a': (1, 1), 'b': (2, 1), 'd': (1, 1)}
+        self.assertEqual((['b', 'd'], ['c']), Watcher.diff(old, new))
+
+    def test_poll(self):
+        change = self.watcher.poll()
+        self.assertListEqual([self.img], change.changed)
+        self.assertEqual(1, change.added)
+        self.assertTrue(self.watcher.poll().is_empty())
+
+    def test_poll_changes(self):
+        self.watcher.poll()
+        nested = os.path.join(self.watched, 'sub', 'b.jpg')
+        shutil.copy(self.img, nested)
+        edit_file(self.img, Edits({'model': 'foo'}))
+
+        change = self.watcher.poll()
+        self.assertListEqual(sorted([self.img, nested]), change.changed)
+        self.assertEqual((1, 1), (change.added, change.updated))
+        self.assertEqual('foo', self.catalog.tags(self.img)['model'])
+
+        os.unlink(nested)
+        self.assertListEqual([nested], self.watcher.poll().removed)
+        self.assertEqual(1, len(self.catalog))
+
+    def test_poll_retries_failed(self):
+        broken = os.path.join(self.watched, 'b.jpg')
+        with open(broken, 'wb') as file:
+            file.write(b'\xff\xd8\xff\xe1\x00\x10Exif\x00\x00garbage!')
+        change = self.watcher.poll()
+        self.assertEqual((1, 1), (change.added, change.failed))
+
+        change = self.watcher.poll()
+        self.assertListEqual([broken], change.changed)
+        self.assertEqual(1, change.failed)
+
+        shutil.copy(self.img, broken)
+        change = self.watcher.poll()
+        self.assertEqual((1, 0), (change.added, change.failed))
+        self.assertTrue(self.watcher.poll().is_empty())
+
+    def test_first_poll_uses_catalog(self):
+        self.catalog.scan([self.watched], Batch(1))
+        self.assertTrue(Watcher(self.catalog, [self.watched], batch=Batch(1)).poll().is_empty())
+
+    def test_run(self):
+        stop = threading.Event()
+        changes = []
+        def callback(change):
+            changes.append(change)
+            stop.set()
+
+        self.watcher.run(callback, stop)
+        self.assertListEqual([self.img], changes[0].changed)
+
+
+if __name__ == '__main__':
+    unittest.main()